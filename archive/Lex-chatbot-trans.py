@@ -22,7 +22,9 @@ Usage:
 Assumes each endpoint speaks a simple OpenAI-style json API. Adapt 'call_llm()' if your API differs.
 """
 
-import os, re, json, time, math, asyncio, random, argparse, datetime
+import os, re, json, time, math, asyncio, random, argparse, datetime, hashlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 from difflib import SequenceMatcher
 
@@ -31,6 +33,28 @@ try:
 except ImportError:
     raise SystemExit("Please: pip install aiohttp")
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    from rapidfuzz import process as rf_process, fuzz as rf_fuzz
+except ImportError:
+    rf_process = rf_fuzz = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from functools import lru_cache
+
 RANDOM_NAMES = [
     "Alex Nguyen","Jordan Patel","Taylor Garcia","Morgan Lopez","Casey Kim",
     "Riley Singh","Drew Johnson","Jamie Ramirez","Cameron Chen","Avery Davis"
@@ -92,47 +116,61 @@ def make_seed_context():
         "time": random.choice(TIMES),
     }
 
+def _json_bytes(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+@lru_cache(maxsize=None)
+def payload_prefix(system_prompt):
+    """Static JSON body prefix, encoded once; the system message never varies."""
+    return (b'{"model":"local-llm","temperature":0.9,"max_tokens":2500,"messages":['
+            + _json_bytes({"role": "system", "content": system_prompt}) + b',')
+
+PAYLOAD_SUFFIX = b']}'
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 async def call_llm(session, endpoint, system_prompt, user_prompt, timeout=60):
     # Example minimal OpenAI-ish chat API; change to your local LLM API format.
-    payload = {
-        "model": "local-llm",
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "temperature": 0.9,
-        "max_tokens": 2500,
-    }
-    async with session.post(endpoint, json=payload, timeout=timeout) as resp:
+    # Only the user message is serialized per call; the rest of the payload is
+    # a pre-encoded bytes prefix shared by every request.
+    data = (payload_prefix(system_prompt)
+            + _json_bytes({"role": "user", "content": user_prompt})
+            + PAYLOAD_SUFFIX)
+    async with session.post(endpoint, data=data, headers=JSON_HEADERS,
+                            timeout=timeout) as resp:
         resp.raise_for_status()
         data = await resp.json()
         # Adjust this path if your API differs
         text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
         return text
 
+TURN_RE = re.compile(r"^[ \t]*(User|Bot):[ \t]*(.*?)[ \t\r]*$", re.MULTILINE)
+
 def parse_plain_conversation(text):
     """
     Turn 'User: ...\\nBot: ...\\n...' into a list of (speaker, utterance).
     Enforce alternating turns; filter empty lines.
+
+    One pass over a precompiled regex instead of splitlines + per-line
+    strip/startswith plus a second alternation-enforcing pass.
     """
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    turns = []
-    for ln in lines:
-        if ln.startswith("User:"):
-            turns.append(("User", ln[len("User:"):].strip()))
-        elif ln.startswith("Bot:"):
-            turns.append(("Bot", ln[len("Bot:"):].strip()))
-    # Enforce alternating by trimming trailing odd lines if needed
     cleaned = []
     expect = None
-    for spk, utt in turns:
+    for m in TURN_RE.finditer(text):
+        spk = m.group(1)
         if expect is None or spk == expect:
-            cleaned.append((spk, utt))
+            cleaned.append((spk, m.group(2)))
             expect = "Bot" if spk == "User" else "User"
-    # Ensure at least 6 turns
-    return cleaned[:], len(cleaned)
+    return cleaned, len(cleaned)
+
+def pad_turns(needed):
+    """Yield minimal close-out turns to reach the minimum turn count."""
+    for i in range(needed):
+        yield ("User", "Okay.") if i % 2 == 0 else ("Bot", "Got it.")
 
 def to_contact_lens_v110(conv_id, turns):
+    # 'turns' may be any iterable; the Transcript is built in a single pass.
     return {
         "Participants": [
             {"ParticipantId": "A1", "ParticipantRole": "AGENT"},
@@ -162,6 +200,42 @@ def similarity(a, b):
 def canon(turns):
     return " ".join(f"{s}:{u}" for s,u in turns).lower()
 
+# SimHash near-dup screening: 64-bit fingerprints compared by Hamming
+# distance instead of the O(len^2) SequenceMatcher DP. All text/regex work
+# stays in plain Python; only the bit-twiddling kernel is JIT-compiled.
+SIMHASH_HAMMING_THRESHOLD = 6
+
+def simhash(text):
+    """64-bit SimHash over whitespace tokens."""
+    weights = [0] * 64
+    for tok in text.split():
+        h = int.from_bytes(hashlib.md5(tok.encode("utf-8")).digest()[:8], "little")
+        for b in range(64):
+            weights[b] += 1 if (h >> b) & 1 else -1
+    out = 0
+    for b in range(64):
+        if weights[b] > 0:
+            out |= 1 << b
+    return out
+
+if np is not None and njit is not None:
+    @njit(cache=True)
+    def hamming_any(prev, h, max_dist):
+        for i in range(prev.shape[0]):
+            x = prev[i] ^ h
+            n = 0
+            while x:
+                x &= x - np.uint64(1)
+                n += 1
+            if n <= max_dist:
+                return True
+        return False
+elif np is not None:
+    def hamming_any(prev, h, max_dist):
+        x = (prev ^ h)[:, None].view(np.uint8)
+        bits = np.unpackbits(x, axis=1).sum(axis=1)
+        return bool((bits <= max_dist).any())
+
 async def worker(idx, endpoint, sem, session, out_dir, rps_delay, min_turns, max_turns, date_str):
     await sem.acquire()
     try:
@@ -176,21 +250,18 @@ async def worker(idx, endpoint, sem, session, out_dir, rps_delay, min_turns, max
 
         text = await call_llm(session, endpoint, SYSTEM_PROMPT, user_prompt)
         turns, n = parse_plain_conversation(text)
-        # If too short, pad with a minimal close-out
-        if n < min_turns:
-            # pad with polite back-and-forth
-            needed = min_turns - n
-            for i in range(needed):
-                turns.append(("User" if i % 2 == 0 else "Bot",
-                              "Okay." if i % 2 == 0 else "Got it."))
         conv_id = f"conv_{idx:05d}"
-        doc = to_contact_lens_v110(conv_id, turns)
+        # If too short, pad with a minimal close-out; the pad turns are
+        # generated inline so the Transcript is assembled in one pass.
+        needed = max(0, min_turns - n)
+        doc = to_contact_lens_v110(conv_id, chain(turns, pad_turns(needed)))
 
         # Filename includes date
         fname = f"local_llm_transcript_{conv_id}_{date_str}.json"
-        with open(out_dir / fname, "w", encoding="utf-8") as f:
+        fname_path = out_dir / fname
+        with open(fname_path, "w", encoding="utf-8") as f:
             json.dump(doc, f, indent=2)
-        return (conv_id, turns)
+        return (conv_id, turns, fname_path)
     finally:
         sem.release()
 
@@ -227,28 +298,53 @@ async def main():
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Basic near-duplicate pruning (optional)
-    # Build canon strings and remove files that are >= 0.92 similar to any prior
+    # Build canon strings and remove files that are >= 0.92 similar to any prior.
+    # Workers already know their own file path, so no directory globbing needed.
     threshold = 0.92
-    seen = []
-    kept_files = []
-    for i, res in enumerate(results):
+    # SoA layout: parallel lists instead of a list of (canon, conv_id) tuples,
+    # so the canon strings can be handed to rapidfuzz in one C-level call.
+    canon_arr = []
+    id_arr = []
+    kept_files = set()
+    duplicates = set()
+    use_simhash = np is not None
+    if use_simhash:
+        seen_hashes = np.empty(len(results), dtype=np.uint64)
+        n_seen = 0
+    for res in results:
         if isinstance(res, Exception):
             continue
-        conv_id, turns = res
+        conv_id, turns, fname_path = res
         c = canon(turns)
         dup = False
-        for c_prev, fname_prev in seen:
-            if similarity(c, c_prev) >= threshold:
-                # delete file
-                for p in out_dir.glob(f"*{conv_id}_*.json"):
-                    p.unlink(missing_ok=True)
-                dup = True
-                break
-        if not dup:
-            seen.append((c, conv_id))
-            # locate filename and keep track
-            for p in out_dir.glob(f"*{conv_id}_*.json"):
-                kept_files.append(p.name)
+        if use_simhash:
+            h = np.uint64(simhash(c))
+            if n_seen:
+                dup = bool(hamming_any(seen_hashes[:n_seen], h,
+                                       SIMHASH_HAMMING_THRESHOLD))
+        elif rf_process is not None:
+            dup = bool(rf_process.extract(c, canon_arr, scorer=rf_fuzz.ratio,
+                                          score_cutoff=threshold * 100, limit=1))
+        else:
+            for c_prev in canon_arr:
+                if similarity(c, c_prev) >= threshold:
+                    dup = True
+                    break
+        if dup:
+            duplicates.add(fname_path)
+        else:
+            if use_simhash:
+                seen_hashes[n_seen] = h
+                n_seen += 1
+            else:
+                canon_arr.append(c)
+                id_arr.append(conv_id)
+            kept_files.add(fname_path)
+
+    # Batch-unlink duplicates; unlink is pure I/O so thread it.
+    if duplicates:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            pool.map(lambda p: p.unlink(missing_ok=True), duplicates)
 
     # Simple summary
     summary = {
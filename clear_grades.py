@@ -14,13 +14,13 @@ db_config = {
 conn = psycopg2.connect(**db_config)
 cur = conn.cursor()
 
-# Count existing records
-cur.execute("SELECT COUNT(*) FROM conversation_grades")
+# Planner row estimate from pg_class - avoids a full table scan just for UX
+cur.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = 'conversation_grades'")
 count = cur.fetchone()[0]
-print(f"Found {count} existing grade records")
+print(f"Found ~{count} existing grade records")
 
-# Clear the table
-cur.execute("DELETE FROM conversation_grades")
+# TRUNCATE is O(1) file truncation vs row-by-row WAL-logged DELETE
+cur.execute("TRUNCATE TABLE conversation_grades RESTART IDENTITY")
 conn.commit()
 
 print("All grading records cleared")
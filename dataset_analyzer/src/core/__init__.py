@@ -1,5 +1,5 @@
 from .file_scanner import FileScanner
 from .format_detector import FormatDetector
-from .metadata_extractor import MetadataExtractor
+from .metadata_extractor import MetadataExtractor, MetadataBatch
 
-__all__ = ['FileScanner', 'FormatDetector', 'MetadataExtractor']
\ No newline at end of file
+__all__ = ['FileScanner', 'FormatDetector', 'MetadataExtractor', 'MetadataBatch']
\ No newline at end of file
@@ -2,9 +2,16 @@
 
 import os
 import hashlib
+import sqlite3
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 from pathlib import Path
-from typing import Iterator, Dict, Any
+from typing import Iterator, Dict, Any, Optional
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 
 @dataclass
 class FileInfo:
@@ -17,11 +24,47 @@ class FileInfo:
 class FileScanner:
     """Recursively scan directories for conversation files"""
     
-    SUPPORTED_EXTENSIONS = {'.json', '.csv', '.txt', '.xml', '.tsv'}
+    # Dotless so the walk can test a cheap name[i+1:] slice directly
+    SUPPORTED_EXTENSIONS = frozenset({'json', 'csv', 'txt', 'xml', 'tsv'})
     
-    def __init__(self, cache_enabled: bool = True):
+    DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'dataset_analyzer' / 'scan.db'
+
+    def __init__(self, cache_enabled: bool = True, cache_path: Optional[str] = None):
         self.cache_enabled = cache_enabled
         self.file_cache = {}
+        self._dirty_paths = set()
+        self._cache_db = None
+        if cache_enabled:
+            self._load_cache(Path(cache_path) if cache_path else self.DEFAULT_CACHE_PATH)
+
+    def _load_cache(self, cache_path: Path):
+        """Open the persistent scan cache and warm file_cache from it"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._cache_db = sqlite3.connect(str(cache_path))
+            self._cache_db.execute(
+                'CREATE TABLE IF NOT EXISTS files '
+                '(path TEXT PRIMARY KEY, size INTEGER, mtime REAL, hash TEXT, extension TEXT)'
+            )
+            for path, size, mtime, file_hash, ext in self._cache_db.execute(
+                    'SELECT path, size, mtime, hash, extension FROM files'):
+                self.file_cache[path] = FileInfo(path, size, mtime, file_hash, ext)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: scan cache unavailable ({e}); running without persistence")
+            self._cache_db = None
+
+    def flush_cache(self):
+        """Write cache entries touched since the last flush back to disk"""
+        if self._cache_db is None or not self._dirty_paths:
+            return
+        rows = [(fi.filepath, fi.size, fi.modified_time, fi.file_hash, fi.extension)
+                for fi in (self.file_cache.get(p) for p in self._dirty_paths)
+                if fi is not None]
+        self._cache_db.executemany(
+            'INSERT OR REPLACE INTO files (path, size, mtime, hash, extension) '
+            'VALUES (?, ?, ?, ?, ?)', rows)
+        self._cache_db.commit()
+        self._dirty_paths.clear()
     
     def scan_directory(self, path: str) -> Iterator[FileInfo]:
         """Scan directory recursively for supported files"""
@@ -29,51 +72,99 @@ class FileScanner:
         if not path_obj.exists():
             raise FileNotFoundError(f"Directory not found: {path}")
         
-        for file_path in path_obj.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
-                try:
-                    file_info = self._create_file_info(file_path)
-                    if self._should_process_file(file_info):
+        candidates = list(self._walk(str(path_obj)))
+
+        # Fan the per-file stat, cache comparison and hash out to threads;
+        # read() and hashlib release the GIL so I/O latency overlaps (on a
+        # cold scan the hashing is nearly all the work). Threads only read
+        # file_cache; mutation stays on the main thread in
+        # _should_process_file.
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for file_info in executor.map(self._safe_file_info, candidates):
+                    if file_info is not None and self._should_process_file(file_info):
                         yield file_info
-                except (OSError, PermissionError) as e:
-                    print(f"Warning: Cannot access {file_path}: {e}")
+        finally:
+            self.flush_cache()
+
+    def _walk(self, path: str) -> Iterator[os.DirEntry]:
+        """Recurse with os.scandir; DirEntry caches stat data from the
+        directory read, avoiding the extra per-file stat rglob incurs"""
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from self._walk(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        name = entry.name
+                        dot = name.rfind('.')
+                        if dot < 0:
+                            continue
+                        ext = name[dot + 1:]
+                        if ext.isascii() and ext.lower() in self.SUPPORTED_EXTENSIONS:
+                            yield entry
+                except OSError as e:
+                    print(f"Warning: Cannot access {entry.path}: {e}")
                     continue
-    
-    def _create_file_info(self, file_path: Path) -> FileInfo:
-        """Create FileInfo object for a file"""
-        stat = file_path.stat()
-        file_hash = self.get_file_hash(str(file_path)) if self.cache_enabled else ""
-        
+
+    def _safe_file_info(self, entry: os.DirEntry) -> Optional[FileInfo]:
+        """Stat, change-check and hash one entry (worker threads).
+
+        Returns None for unreadable and for unchanged files; file_cache is
+        only read here, never written."""
+        try:
+            file_info = self._create_file_info(entry)
+        except (OSError, PermissionError) as e:
+            print(f"Warning: Cannot access {entry.path}: {e}")
+            return None
+
+        if not self.cache_enabled:
+            return file_info
+
+        # rsync-style quick check: unchanged (size, mtime) means the content
+        # hash cannot have changed, so skip without touching file bytes
+        cached_info = self.file_cache.get(file_info.filepath)
+        if (cached_info is not None and
+            cached_info.size == file_info.size and
+            cached_info.modified_time == file_info.modified_time):
+            return None
+
+        # New or changed file: hash it here so the pool overlaps the reads
+        file_info.file_hash = self.get_file_hash(file_info.filepath)
+        return file_info
+
+    def _create_file_info(self, entry: os.DirEntry) -> FileInfo:
+        """Create FileInfo object for a directory entry (hash filled in lazily)"""
+        stat = entry.stat()
+
         return FileInfo(
-            filepath=str(file_path),
+            filepath=entry.path,
             size=stat.st_size,
             modified_time=stat.st_mtime,
-            file_hash=file_hash,
-            extension=file_path.suffix.lower()
+            file_hash="",
+            extension=entry.name[entry.name.rfind('.'):].lower()
         )
     
     def get_file_hash(self, filepath: str) -> str:
         """Generate hash for file (for incremental processing)"""
         try:
+            # Stream in 1MB chunks so memory stays flat for large dumps;
+            # xxhash when available, blake2b otherwise (both beat md5)
+            h = xxhash.xxh3_64() if xxhash else hashlib.blake2b(digest_size=16)
             with open(filepath, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
+                while chunk := f.read(1 << 20):
+                    h.update(chunk)
+            return h.hexdigest()
         except Exception:
             return ""
     
     def _should_process_file(self, file_info: FileInfo) -> bool:
-        """Check if file should be processed (incremental processing)"""
+        """Record a new/changed file in the cache (main thread only);
+        the change check and hashing already happened in the pool"""
         if not self.cache_enabled:
             return True
-        
-        cached_info = self.file_cache.get(file_info.filepath)
-        if cached_info is None:
-            self.file_cache[file_info.filepath] = file_info
-            return True
-        
-        # Check if file changed
-        if (cached_info.file_hash != file_info.file_hash or 
-            cached_info.modified_time != file_info.modified_time):
-            self.file_cache[file_info.filepath] = file_info
-            return True
-        
-        return False
\ No newline at end of file
+
+        self.file_cache[file_info.filepath] = file_info
+        self._dirty_paths.add(file_info.filepath)
+        return True
\ No newline at end of file
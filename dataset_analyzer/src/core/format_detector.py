@@ -2,12 +2,44 @@
 
 import json
 import csv
+import mmap
+import multiprocessing as mp
+import os
+import re
+import sys
 import xml.etree.ElementTree as ET
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+# Above this size, mmap the file so parsing reads straight from the page cache
+_MMAP_THRESHOLD = 4 << 20
+
+# Long transcript cells would otherwise trip _csv.Error's default 128KB limit
+csv.field_size_limit(sys.maxsize)
+
+# 1MB read buffer; the default 8KB throttles multi-MB CSV/txt transcripts
+_READ_BUFFERING = 1 << 20
+
 class FileFormat(Enum):
     JSON = "json"
     CSV = "csv"
@@ -22,12 +54,68 @@ class ConversationData:
     turns: List[Dict[str, Any]]
     metadata: Dict[str, Any]
     source_file: str
+    # Columnar (speaker, text) view of turns for vectorized downstream
+    # aggregation; None when pyarrow is unavailable
+    batch: Optional[Any] = None
+
+def _turns_batch(turns):
+    """Build a pyarrow RecordBatch over (speaker, text) columns"""
+    if pa is None:
+        return None
+    sp_list = []
+    tx_list = []
+    for turn in turns:
+        if isinstance(turn, dict):
+            sp_list.append(turn.get('speaker', 'unknown'))
+            tx_list.append(turn.get('text', '') or '')
+    return pa.RecordBatch.from_arrays(
+        [pa.array(sp_list).dictionary_encode(),
+         pa.array(tx_list, type=pa.large_string())],
+        names=['speaker', 'text'])
+
+# Per-process detector for parse_batch workers and the detection cache;
+# built lazily so nothing needs to be pickled across the fork
+_worker_detector = None
+
+def _get_detector() -> "FormatDetector":
+    global _worker_detector
+    if _worker_detector is None:
+        _worker_detector = FormatDetector()
+    return _worker_detector
+
+def _parse_worker(filepath: str) -> Optional[ConversationData]:
+    return _get_detector().parse_file(filepath)
+
+@lru_cache(maxsize=4096)
+def _detect_cached(filepath: str, size: int, mtime: float) -> "FileFormat":
+    # size/mtime participate only as invalidation keys; a touched file gets
+    # a fresh detection, an unchanged one is a dict hit
+    return _get_detector()._detect_format_uncached(filepath)
 
 class FormatDetector:
     """Auto-detect file formats and parse conversation data"""
-    
+
+    @classmethod
+    def parse_batch(cls, paths, workers: int = None):
+        """Parse many files across a process pool, yielding ConversationData
+        as results complete (completion order, not input order)"""
+        with mp.Pool(processes=workers or os.cpu_count()) as pool:
+            for conversation in pool.imap_unordered(_parse_worker, paths, chunksize=16):
+                if conversation is not None:
+                    yield conversation
+
     def detect_format(self, filepath: str) -> FileFormat:
-        """Detect file format based on extension and content"""
+        """Detect file format based on extension and content.
+
+        Results are cached per (path, size, mtime) so repeated detection of
+        an unchanged file within a run costs one stat."""
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return FileFormat.UNKNOWN
+        return _detect_cached(filepath, stat.st_size, stat.st_mtime)
+
+    def _detect_format_uncached(self, filepath: str) -> FileFormat:
         path = Path(filepath)
         extension = path.suffix.lower()
         
@@ -73,38 +161,41 @@ class FormatDetector:
             print(f"Error parsing {filepath}: {e}")
             return None
     
+    @staticmethod
+    def _peek(filepath: str, n: int = 64) -> bytes:
+        """Read the first n raw bytes, minus leading whitespace"""
+        with open(filepath, 'rb') as f:
+            return f.read(n).lstrip()
+
     def _validate_format_by_content(self, filepath: str, expected_format: FileFormat) -> bool:
-        """Validate format by inspecting file content"""
+        """Validate format by inspecting the first bytes of the file"""
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                first_line = f.readline().strip()
-            
+            head = self._peek(filepath)
+
             if expected_format == FileFormat.JSON:
-                return first_line.startswith('{') or first_line.startswith('[')
+                return head[:1] in (b'{', b'[')
             elif expected_format == FileFormat.XML:
-                return first_line.startswith('<?xml') or first_line.startswith('<')
+                return head[:1] == b'<'
             elif expected_format in [FileFormat.CSV, FileFormat.TSV]:
-                delimiter = '\t' if expected_format == FileFormat.TSV else ','
-                return delimiter in first_line
-            
+                delimiter = b'\t' if expected_format == FileFormat.TSV else b','
+                return delimiter in head
+
             return True
         except Exception:
             return False
-    
+
     def _detect_by_content(self, filepath: str) -> FileFormat:
-        """Detect format by analyzing file content"""
+        """Detect format from a small byte peek instead of a 1KB text slurp"""
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read(1024)  # Read first 1KB
-            
-            content = content.strip()
-            if content.startswith('{') or content.startswith('['):
+            head = self._peek(filepath)
+
+            if head[:1] in (b'{', b'['):
                 return FileFormat.JSON
-            elif content.startswith('<?xml') or content.startswith('<'):
+            elif head[:1] == b'<':
                 return FileFormat.XML
-            elif '\t' in content:
+            elif b'\t' in head:
                 return FileFormat.TSV
-            elif ',' in content:
+            elif b',' in head:
                 return FileFormat.CSV
             else:
                 return FileFormat.TXT
@@ -113,14 +204,31 @@ class FormatDetector:
     
     def _parse_json(self, filepath: str) -> ConversationData:
         """Parse JSON conversation file"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # orjson wants bytes, not file objects; read (or mmap) and parse
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    data = _json_loads(bytes(mm))
+            else:
+                data = _json_loads(f.read())
         
         # Handle different JSON structures
         if isinstance(data, list):
-            # Array of turns
+            # Array of turns; collect speakers in the same pass instead of
+            # rescanning with a generator+set afterwards
             turns = data
-            speakers = list(set(turn.get('speaker', 'unknown') for turn in turns if isinstance(turn, dict)))
+            speakers_set = set()
+            # Intern speakers: 2-ish labels repeat across every turn, so all
+            # turn dicts share one str object and set adds are id-compares
+            for turn in turns:
+                if isinstance(turn, dict):
+                    speaker = turn.get('speaker', 'unknown')
+                    if isinstance(speaker, str):
+                        speaker = sys.intern(speaker)
+                        if 'speaker' in turn:
+                            turn['speaker'] = speaker
+                    speakers_set.add(speaker)
+            speakers = list(speakers_set)
             metadata = {}
         elif isinstance(data, dict):
             if 'turns' in data:
@@ -139,60 +247,72 @@ class FormatDetector:
             speakers=speakers,
             turns=turns,
             metadata=metadata,
-            source_file=filepath
+            source_file=filepath,
+            batch=_turns_batch(turns)
         )
     
     def _parse_csv(self, filepath: str, delimiter: str = ',') -> ConversationData:
         """Parse CSV conversation file"""
         turns = []
         speakers = set()
-        
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter=delimiter)
+
+        with open(filepath, 'r', encoding='utf-8', newline='', buffering=_READ_BUFFERING) as f:
+            # csv.reader with column indices resolved once from the header;
+            # DictReader allocates a dict and does keyed lookups per row
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                return ConversationData([], [], {'format': 'csv'}, filepath)
+
+            lower = [h.lower() for h in header]
+            speaker_idx = next((i for i, h in enumerate(lower) if h in ('speaker', 'role')), -1)
+            text_idx = next((i for i, h in enumerate(lower) if h in ('text', 'message', 'content')), -1)
+            extra_cols = [(i, h) for i, h in enumerate(header) if i not in (speaker_idx, text_idx)]
+
             for row in reader:
-                # Common CSV column mappings
-                speaker = row.get('speaker') or row.get('Speaker') or row.get('role') or 'unknown'
-                text = row.get('text') or row.get('Text') or row.get('message') or row.get('content', '')
-                
+                speaker = row[speaker_idx] if 0 <= speaker_idx < len(row) and row[speaker_idx] else 'unknown'
+                speaker = sys.intern(speaker)
+                text = row[text_idx] if 0 <= text_idx < len(row) else ''
+
                 speakers.add(speaker)
-                turns.append({
-                    'speaker': speaker,
-                    'text': text,
-                    **{k: v for k, v in row.items() if k not in ['speaker', 'text', 'Speaker', 'Text']}
-                })
+                turn = {'speaker': speaker, 'text': text}
+                for i, col in extra_cols:
+                    if i < len(row):
+                        turn[col] = row[i]
+                turns.append(turn)
         
         return ConversationData(
             speakers=list(speakers),
             turns=turns,
             metadata={'format': 'csv'},
-            source_file=filepath
+            source_file=filepath,
+            batch=_turns_batch(turns)
         )
     
     def _parse_txt(self, filepath: str) -> ConversationData:
         """Parse plain text conversation file"""
-        with open(filepath, 'r', encoding='utf-8') as f:
+        with open(filepath, 'r', encoding='utf-8', newline='', buffering=_READ_BUFFERING) as f:
             content = f.read()
         
         # Simple heuristic: lines starting with "Speaker:" or similar
         lines = content.split('\n')
         turns = []
         speakers = set()
-        
+
         for line in lines:
             line = line.strip()
             if not line:
                 continue
-            
-            # Look for speaker patterns
-            if ':' in line:
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    speaker = parts[0].strip()
-                    text = parts[1].strip()
-                    speakers.add(speaker)
-                    turns.append({'speaker': speaker, 'text': text})
-                    continue
-            
+
+            # Look for speaker patterns (compiled once; bounded label length
+            # keeps colons inside URLs/timestamps from being split on)
+            m = self.SPEAKER_RE.match(line)
+            if m:
+                speaker = sys.intern(m.group(1).strip())
+                speakers.add(speaker)
+                turns.append({'speaker': speaker, 'text': m.group(2)})
+                continue
+
             # Fallback: treat as single speaker
             turns.append({'speaker': 'unknown', 'text': line})
         
@@ -200,38 +320,39 @@ class FormatDetector:
             speakers=list(speakers) if speakers else ['unknown'],
             turns=turns,
             metadata={'format': 'txt'},
-            source_file=filepath
+            source_file=filepath,
+            batch=_turns_batch(turns)
         )
     
+    XML_TURN_TAGS = ('turn', 'message', 'utterance')
+
+    SPEAKER_RE = re.compile(r'^([^\s:][^:]{0,60}):\s*(.*)$')
+
     def _parse_xml(self, filepath: str) -> ConversationData:
         """Parse XML conversation file"""
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
         turns = []
         speakers = set()
-        
-        # Common XML structures
-        for turn_elem in root.findall('.//turn') or root.findall('.//message') or root.findall('.//utterance'):
-            speaker = turn_elem.get('speaker') or turn_elem.find('speaker')
-            text = turn_elem.text or turn_elem.find('text')
-            
-            if speaker is not None:
-                speaker = speaker.text if hasattr(speaker, 'text') else str(speaker)
-            else:
-                speaker = 'unknown'
-            
-            if text is not None:
-                text = text.text if hasattr(text, 'text') else str(text)
-            else:
-                text = ''
-            
+
+        # Stream turn elements instead of building the whole DOM up front;
+        # lxml's libxml2 iterparse when available, stdlib iterparse otherwise
+        if lxml_etree is not None:
+            events = lxml_etree.iterparse(filepath, tag=self.XML_TURN_TAGS)
+        else:
+            events = ((event, elem) for event, elem in ET.iterparse(filepath)
+                      if elem.tag in self.XML_TURN_TAGS)
+
+        for _, elem in events:
+            speaker = elem.get('speaker') or elem.findtext('speaker') or 'unknown'
+            text = elem.text or elem.findtext('text') or ''
+
             speakers.add(speaker)
             turns.append({'speaker': speaker, 'text': text})
+            elem.clear()  # release the parsed subtree as we go
         
         return ConversationData(
             speakers=list(speakers),
             turns=turns,
             metadata={'format': 'xml'},
-            source_file=filepath
+            source_file=filepath,
+            batch=_turns_batch(turns)
         )
\ No newline at end of file
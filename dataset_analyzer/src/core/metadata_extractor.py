@@ -1,10 +1,55 @@
 """Conversation metadata extraction module"""
 
-from typing import Dict, Any, List
+import re
+import sys
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from .format_detector import ConversationData
 
-@dataclass
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+_WORD_RE = re.compile(r'\S+')
+
+# JIT compilation and array building have fixed costs; short transcripts
+# stay on the pure-Python fused loop
+_JIT_MIN_TURNS = 1024
+
+if numba is not None and np is not None:
+    @numba.njit(cache=True)
+    def _agg_kernel(speaker_ids, word_counts):
+        """Numeric reduction over a transcript: (alternations, empty, short, total)"""
+        alternations = 0
+        empty = 0
+        short = 0
+        total = 0
+        for i in range(word_counts.shape[0]):
+            words = word_counts[i]
+            total += words
+            if words == 0:
+                empty += 1
+            if words < 2:
+                short += 1
+            if i > 0 and speaker_ids[i] != speaker_ids[i - 1]:
+                alternations += 1
+        return alternations, empty, short, total
+else:
+    _agg_kernel = None
+
+def _word_count(text: str) -> int:
+    """Count whitespace-separated tokens without materializing them"""
+    if not text:
+        return 0
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+@dataclass(slots=True, frozen=True)
 class ConversationMetadata:
     turn_count: int
     speaker_count: int
@@ -15,37 +60,142 @@ class ConversationMetadata:
     quality_indicators: Dict[str, Any]
     source_file: str
 
+class MetadataBatch:
+    """Columnar (SoA) accumulator for per-conversation metadata.
+
+    Numeric fields live in parallel lists that finalize into NumPy arrays,
+    so cross-corpus aggregation (histograms, percentiles) runs vectorized
+    instead of walking a list of ConversationMetadata objects."""
+
+    def __init__(self):
+        self.turn_counts = []
+        self.speaker_counts = []
+        self.avg_turn_lengths = []
+        self.total_lengths = []
+        self.speakers = []
+        self.source_files = []
+
+    def __len__(self) -> int:
+        return len(self.turn_counts)
+
+    def append(self, meta) -> None:
+        """Accumulate one conversation's metadata (dataclass or plain dict)"""
+        if isinstance(meta, dict):
+            get = meta.get
+        else:
+            get = lambda key, default=None: getattr(meta, key, default)
+        self.turn_counts.append(get('turn_count', 0))
+        self.speaker_counts.append(get('speaker_count', 0))
+        self.avg_turn_lengths.append(get('avg_turn_length', 0.0))
+        self.total_lengths.append(get('total_length', 0))
+        self.speakers.append(get('speakers', []))
+        self.source_files.append(get('source_file', ''))
+
+    def finalize(self) -> Optional[Dict[str, Any]]:
+        """Convert accumulated columns to fixed-size arrays.
+
+        Returns None when NumPy is unavailable."""
+        if np is None:
+            return None
+        return {
+            'turn_counts': np.asarray(self.turn_counts, dtype=np.int64),
+            'speaker_counts': np.asarray(self.speaker_counts, dtype=np.int64),
+            'avg_turn_lengths': np.asarray(self.avg_turn_lengths, dtype=np.float64),
+            'total_lengths': np.asarray(self.total_lengths, dtype=np.int64),
+            'speakers': np.asarray(self.speakers, dtype=object),
+            'source_files': np.asarray(self.source_files, dtype=object),
+        }
+
+    def save(self, filepath) -> bool:
+        """Write the batch as a compressed NPZ; no-op without NumPy"""
+        arrays = self.finalize()
+        if arrays is None:
+            return False
+        np.savez_compressed(filepath, **arrays)
+        return True
+
 class MetadataExtractor:
     """Extract metadata from conversation data"""
     
     def extract_conversation_metadata(self, conversation: ConversationData) -> ConversationMetadata:
         """Extract comprehensive metadata from conversation"""
-        
+
         turns = conversation.turns
-        speakers = conversation.speakers
-        
+        # Intern the handful of recurring labels so comparisons below are
+        # pointer checks and every reference shares one str object
+        speakers = [sys.intern(s) if isinstance(s, str) else s
+                    for s in conversation.speakers]
+
         # Basic metrics
         turn_count = len(turns)
         speaker_count = len(speakers)
-        
-        # Text analysis
-        turn_lengths = []
+
+        # One fused pass over turns: lengths, quality tallies and speaker
+        # alternation together, so each text is fetched and split once
         total_length = 0
-        
-        for turn in turns:
-            text = turn.get('text', '')
-            length = len(text.split()) if text else 0
-            turn_lengths.append(length)
-            total_length += length
-        
-        avg_turn_length = sum(turn_lengths) / len(turn_lengths) if turn_lengths else 0
-        
+        empty_turns = 0
+        very_short_turns = 0
+        alternations = 0
+        prev_speaker = None
+        has_timestamps = False
+        has_confidence = False
+
+        if _agg_kernel is not None and turn_count >= _JIT_MIN_TURNS:
+            # Long transcripts: one Python pass builds small-int arrays, then
+            # the JIT kernel does the numeric reduction at machine speed
+            speaker_ids = np.empty(turn_count, dtype=np.int32)
+            word_counts = np.empty(turn_count, dtype=np.int32)
+            id_map = {}
+            for i, turn in enumerate(turns):
+                word_counts[i] = _word_count(turn.get('text', ''))
+                speaker = turn.get('speaker', 'unknown')
+                speaker_ids[i] = id_map.setdefault(speaker, len(id_map))
+                if not has_timestamps:
+                    has_timestamps = 'timestamp' in turn
+                if not has_confidence:
+                    has_confidence = 'confidence' in turn
+            alternations, empty_turns, very_short_turns, total_length = \
+                _agg_kernel(speaker_ids, word_counts)
+        else:
+            for turn in turns:
+                text = turn.get('text', '')
+                words = _word_count(text)
+                total_length += words
+
+                # zero words == nothing but whitespace
+                if words == 0:
+                    empty_turns += 1
+                if words < 2:
+                    very_short_turns += 1
+
+                speaker = turn.get('speaker', 'unknown')
+                if isinstance(speaker, str):
+                    speaker = sys.intern(speaker)
+                if prev_speaker is not None and speaker != prev_speaker:
+                    alternations += 1
+                prev_speaker = speaker
+
+                # Membership tests stop once a key has been seen anywhere
+                if not has_timestamps:
+                    has_timestamps = 'timestamp' in turn
+                if not has_confidence:
+                    has_confidence = 'confidence' in turn
+
+        avg_turn_length = total_length / turn_count if turn_count else 0
+
         # Conversation type detection
-        conversation_type = self._detect_conversation_type(conversation)
-        
+        conversation_type = self._detect_conversation_type(speaker_count)
+
         # Quality indicators
-        quality_indicators = self._analyze_quality(conversation)
-        
+        quality_indicators = {
+            'completeness': 1.0 - (empty_turns / turn_count) if turn_count else 0.0,
+            'alternation_score': alternations / (turn_count - 1) if turn_count > 1 else 1.0,
+            'empty_turns': empty_turns,
+            'very_short_turns': very_short_turns,
+            'has_timestamps': has_timestamps,
+            'has_confidence': has_confidence
+        }
+
         return ConversationMetadata(
             turn_count=turn_count,
             speaker_count=speaker_count,
@@ -57,52 +207,18 @@ class MetadataExtractor:
             source_file=conversation.source_file
         )
     
-    def _detect_conversation_type(self, conversation: ConversationData) -> str:
-        """Detect conversation type based on patterns"""
-        turns = conversation.turns
-        speakers = conversation.speakers
-        
-        # Simple heuristics
-        if len(speakers) == 1:
-            return "monologue"
-        elif len(speakers) == 2:
-            return "dialogue"
-        else:
-            return "multi_party"
-    
-    def _analyze_quality(self, conversation: ConversationData) -> Dict[str, Any]:
-        """Analyze conversation quality indicators"""
-        turns = conversation.turns
-        
-        # Quality metrics
-        empty_turns = sum(1 for turn in turns if not turn.get('text', '').strip())
-        very_short_turns = sum(1 for turn in turns if len(turn.get('text', '').split()) < 2)
-        
-        # Speaker alternation
-        speaker_sequence = [turn.get('speaker', 'unknown') for turn in turns]
-        alternation_score = self._calculate_alternation_score(speaker_sequence)
-        
-        # Completeness
-        completeness_score = 1.0 - (empty_turns / len(turns)) if turns else 0.0
-        
-        return {
-            'completeness': completeness_score,
-            'alternation_score': alternation_score,
-            'empty_turns': empty_turns,
-            'very_short_turns': very_short_turns,
-            'has_timestamps': any('timestamp' in turn for turn in turns),
-            'has_confidence': any('confidence' in turn for turn in turns)
-        }
+    _TYPE_MAP = {1: "monologue", 2: "dialogue"}
+
+    def _detect_conversation_type(self, speaker_count: int) -> str:
+        """Detect conversation type from the already-computed speaker count"""
+        return self._TYPE_MAP.get(speaker_count, "multi_party")
     
     def _calculate_alternation_score(self, speaker_sequence: List[str]) -> float:
         """Calculate how well speakers alternate (0-1 score)"""
-        if len(speaker_sequence) < 2:
+        n = len(speaker_sequence)
+        if n < 2:
             return 1.0
-        
-        alternations = 0
-        for i in range(1, len(speaker_sequence)):
-            if speaker_sequence[i] != speaker_sequence[i-1]:
-                alternations += 1
-        
-        max_alternations = len(speaker_sequence) - 1
-        return alternations / max_alternations if max_alternations > 0 else 1.0
\ No newline at end of file
+
+        # Pairwise compare via zip keeps the loop on the C fast path
+        alternations = sum(1 for a, b in zip(speaker_sequence, speaker_sequence[1:]) if a != b)
+        return alternations / (n - 1)
\ No newline at end of file
@@ -1,14 +1,66 @@
 """Command line interface for dataset analyzer"""
 
+import json
+import multiprocessing
 import click
 import yaml
 from pathlib import Path
 from typing import Optional
 
-from ..core import FileScanner, FormatDetector, MetadataExtractor
+from ..core import FileScanner, FormatDetector, MetadataExtractor, MetadataBatch
 from ..utils.config_manager import ConfigManager
 from ..utils.logger import setup_logger
 
+# libyaml's C dumper when compiled in; pure-Python safe dumper otherwise
+try:
+    _YamlDumper = yaml.CSafeDumper
+except AttributeError:
+    _YamlDumper = yaml.SafeDumper
+
+# Rust-based orjson encoder when installed; stdlib otherwise
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+# Per-worker parse/extract components, created once by the Pool initializer
+# so nothing heavyweight is pickled per task
+_detector = None
+_extractor = None
+
+def _init_scan_worker():
+    global _detector, _extractor
+    _detector = FormatDetector()
+    _extractor = MetadataExtractor()
+
+def _process_one(file_info):
+    """Parse + extract metadata for one file; runs in a pool worker"""
+    conversation = _detector.parse_file(file_info.filepath)
+    if conversation is None:
+        return file_info.filepath, None
+
+    metadata = _extractor.extract_conversation_metadata(conversation)
+    return file_info.filepath, {
+        'file_info': {
+            'filepath': file_info.filepath,
+            'size': file_info.size,
+            'extension': file_info.extension
+        },
+        'metadata': {
+            'turn_count': metadata.turn_count,
+            'speaker_count': metadata.speaker_count,
+            'avg_turn_length': metadata.avg_turn_length,
+            'total_length': metadata.total_length,
+            'speakers': metadata.speakers,
+            'conversation_type': metadata.conversation_type,
+            'quality_indicators': metadata.quality_indicators
+        }
+    }
+
 @click.group()
 @click.option('--config', '-c', help='Configuration file path')
 @click.option('--verbose', '-v', is_flag=True, help='Verbose output')
@@ -37,72 +89,82 @@ def scan(ctx, input: str, output: str, format: str):
     logger = ctx.obj['logger']
     config = ctx.obj['config']
     
-    logger.info(f"Scanning directory: {input}")
+    logger.info("Scanning directory: %s", input)
     
     # Initialize components
     scanner = FileScanner(cache_enabled=config.get('processing.cache_enabled', True))
-    detector = FormatDetector()
-    extractor = MetadataExtractor()
-    
+
     # Create output directory
     output_path = Path(output)
     output_path.mkdir(parents=True, exist_ok=True)
-    
-    # Scan and analyze files
-    results = []
+
+    # Scan and analyze files; parse + metadata extraction fan out across a
+    # process pool while the main process streams each result straight to
+    # disk, so memory stays flat no matter how large the corpus is
+    output_file = output_path / f"scan_results.{format}"
+    results_written = 0
     file_count = 0
-    
+    # Columnar accumulator for the cross-corpus NPZ sidecar
+    batch = MetadataBatch()
+
     try:
-        for file_info in scanner.scan_directory(input):
-            file_count += 1
-            logger.info(f"Processing file {file_count}: {file_info.filepath}")
-            
-            # Parse conversation
-            conversation = detector.parse_file(file_info.filepath)
-            if conversation is None:
-                logger.warning(f"Failed to parse: {file_info.filepath}")
-                continue
-            
-            # Extract metadata
-            metadata = extractor.extract_conversation_metadata(conversation)
-            
-            # Store result
-            result = {
-                'file_info': {
-                    'filepath': file_info.filepath,
-                    'size': file_info.size,
-                    'extension': file_info.extension
-                },
-                'metadata': {
-                    'turn_count': metadata.turn_count,
-                    'speaker_count': metadata.speaker_count,
-                    'avg_turn_length': metadata.avg_turn_length,
-                    'total_length': metadata.total_length,
-                    'speakers': metadata.speakers,
-                    'conversation_type': metadata.conversation_type,
-                    'quality_indicators': metadata.quality_indicators
-                }
-            }
-            results.append(result)
-    
+        with open(output_file, 'wb' if format == 'json' else 'w') as out:
+            # The closing bytes live in a finally so an interrupted or
+            # failed scan still leaves a parseable document on disk,
+            # matching the write-complete-or-nothing behaviour the
+            # non-streamed writer had
+            try:
+                if format == 'json':
+                    out.write(b'{"scan_results": [')
+
+                with multiprocessing.Pool(initializer=_init_scan_worker) as pool:
+                    for filepath, result in pool.imap(
+                            _process_one, scanner.scan_directory(input), chunksize=16):
+                        file_count += 1
+                        # Lazy %-formatting: no string is built unless the
+                        # record is actually emitted
+                        logger.debug("Processing file %d: %s", file_count, filepath)
+                        if file_count % 500 == 0:
+                            logger.info("Processed %d files...", file_count)
+
+                        if result is None:
+                            logger.warning("Failed to parse: %s", filepath)
+                            continue
+
+                        if format == 'yaml':
+                            yaml.dump(result, out, Dumper=_YamlDumper,
+                                      default_flow_style=False, explicit_start=True)
+                        elif format == 'json':
+                            # Serialize before touching the file so a bad
+                            # record can't leave a dangling separator comma
+                            payload = _json_dumps(result)
+                            if results_written:
+                                out.write(b',')
+                            out.write(payload)
+                        batch.append(dict(result['metadata'], source_file=filepath))
+                        results_written += 1
+            finally:
+                if format == 'json':
+                    out.write(b'], "total_files": %d}' % results_written)
+
     except KeyboardInterrupt:
         logger.info("Scan interrupted by user")
     except Exception as e:
-        logger.error(f"Error during scan: {e}")
+        logger.error("Error during scan: %s", e)
         return
-    
-    # Save results
-    output_file = output_path / f"scan_results.{format}"
-    
-    if format == 'yaml':
-        with open(output_file, 'w') as f:
-            yaml.dump({'scan_results': results, 'total_files': len(results)}, f, default_flow_style=False)
-    elif format == 'json':
-        import json
-        with open(output_file, 'w') as f:
-            json.dump({'scan_results': results, 'total_files': len(results)}, f, indent=2)
-    
-    logger.info(f"Scan complete. Processed {len(results)} files. Results saved to: {output_file}")
+
+    # Columnar NPZ sidecar for vectorized cross-corpus stats (NumPy only)
+    if len(batch):
+        batch_file = output_path / 'scan_results.npz'
+        if batch.save(batch_file):
+            logger.info("Metadata batch saved to: %s", batch_file)
+
+    # Totals live in a small sibling summary so partial outputs stay usable
+    summary_file = output_path / 'scan_results.summary.json'
+    with open(summary_file, 'wb') as f:
+        f.write(_json_dumps({'total_files': results_written, 'scanned_files': file_count}))
+
+    logger.info("Scan complete. Processed %d files. Results saved to: %s", results_written, output_file)
 
 @cli.command()
 @click.option('--llm', default='openai', help='LLM provider (openai, local, ollama)')
@@ -115,7 +177,7 @@ def generate_templates(ctx, llm: str, model: Optional[str], export: str):
     config = ctx.obj['config']
     
     logger.info("Template generation not yet implemented")
-    logger.info(f"Would use LLM: {llm}, Model: {model}, Export: {export}")
+    logger.info("Would use LLM: %s, Model: %s, Export: %s", llm, model, export)
 
 @cli.command()
 @click.option('--templates', help='Templates directory to validate')
@@ -126,7 +188,7 @@ def validate(ctx, templates: Optional[str], sample_size: int):
     logger = ctx.obj['logger']
     
     logger.info("Template validation not yet implemented")
-    logger.info(f"Would validate templates in: {templates}, Sample size: {sample_size}")
+    logger.info("Would validate templates in: %s, Sample size: %d", templates, sample_size)
 
 def main():
     """Entry point for CLI"""
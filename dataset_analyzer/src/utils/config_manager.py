@@ -1,18 +1,51 @@
 """Configuration management module"""
 
+import copy
+import threading
 import yaml
 from pathlib import Path
 from typing import Any, Optional, Dict
 
+# libyaml's C loader when compiled in; pure-Python safe loader otherwise
+try:
+    _YamlLoader = yaml.CSafeLoader
+except AttributeError:
+    _YamlLoader = yaml.SafeLoader
+
+# Loaded configs keyed by requested path; repeat constructions in the same
+# process skip the search-path stat calls and YAML parse entirely
+_CONFIG_CACHE: Dict[Optional[str], Dict[str, Any]] = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
 class ConfigManager:
     """Manage configuration loading and access"""
     
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path
         self.config = self._load_config()
+        self._flat = self._flatten(self.config) if isinstance(self.config, dict) else {}
+
+    @staticmethod
+    def _flatten(config: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+        """Flatten nested config into dot-notation keys for O(1) lookups"""
+        flat = {}
+        for k, v in config.items():
+            key = prefix + k
+            flat[key] = v
+            if isinstance(v, dict):
+                flat.update(ConfigManager._flatten(v, key + '.'))
+        return flat
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from file"""
+        """Load configuration from file (cached per requested path)"""
+        with _CONFIG_CACHE_LOCK:
+            if self.config_path not in _CONFIG_CACHE:
+                _CONFIG_CACHE[self.config_path] = self._load_config_uncached()
+            # Hand each instance its own copy so set() stays instance-local;
+            # the stat calls and YAML parse are the expensive part, not this
+            return copy.deepcopy(_CONFIG_CACHE[self.config_path])
+
+    def _load_config_uncached(self) -> Dict[str, Any]:
         search_paths = []
         
         if self.config_path:
@@ -30,7 +63,7 @@ class ConfigManager:
             if path_obj.exists():
                 try:
                     with open(path_obj, 'r') as f:
-                        config = yaml.safe_load(f)
+                        config = yaml.load(f, Loader=_YamlLoader)
                     print(f"Loaded config from: {path_obj}")
                     return config
                 except Exception as e:
@@ -60,25 +93,20 @@ class ConfigManager:
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation"""
-        keys = key.split('.')
-        value = self.config
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        
-        return value
-    
+        # Flat view built at load time: no per-call split or dict walk
+        return self._flat.get(key, default)
+
     def set(self, key: str, value: Any) -> None:
         """Set configuration value using dot notation"""
         keys = key.split('.')
         config = self.config
-        
+
         for k in keys[:-1]:
             if k not in config:
                 config[k] = {}
             config = config[k]
-        
-        config[keys[-1]] = value
\ No newline at end of file
+
+        config[keys[-1]] = value
+
+        # Sets are rare and gets are hot, so just rebuild the flat view
+        self._flat = self._flatten(self.config)
\ No newline at end of file
@@ -4,32 +4,27 @@ import logging
 import sys
 from typing import Optional
 
+# One formatter/handler pair for the whole process; setup_logger calls for
+# fresh logger names share these instead of rebuilding them each time
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+_HANDLER = logging.StreamHandler(sys.stdout)
+_HANDLER.setFormatter(_FORMATTER)
+
 def setup_logger(verbose: bool = False, name: Optional[str] = None) -> logging.Logger:
     """Setup logger with appropriate level and formatting"""
-    
+
     logger_name = name or 'dataset_analyzer'
     logger = logging.getLogger(logger_name)
-    
-    # Avoid duplicate handlers
-    if logger.handlers:
-        return logger
-    
+
     # Set level
     level = logging.DEBUG if verbose else logging.INFO
     logger.setLevel(level)
-    
-    # Create console handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(level)
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
-    
-    # Add handler to logger
-    logger.addHandler(handler)
-    
-    return logger
\ No newline at end of file
+
+    # Attach the shared handler once; repeat calls are no-ops
+    if _HANDLER not in logger.handlers:
+        logger.addHandler(_HANDLER)
+
+    return logger
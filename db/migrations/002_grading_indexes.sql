@@ -0,0 +1,15 @@
+-- Grading query indexes
+-- Supports the "ungraded conversations" anti-join in the graders:
+--   conversations LEFT JOIN conversation_grades g ON g.conversation_id = c.id
+--   WHERE g.conversation_id IS NULL ORDER BY c.created_at DESC
+
+-- Probe side of the anti-join: one index lookup per conversation row
+CREATE INDEX IF NOT EXISTS idx_conversation_grades_conversation_id
+    ON conversation_grades(conversation_id);
+
+-- Drive side: newest-first walk that can stop at the LIMIT. No INCLUDE:
+-- transcripts routinely exceed the ~2.7KB btree tuple cap, so covering
+-- content would make inserts fail, and the query heap-fetches at most
+-- LIMIT rows anyway.
+CREATE INDEX IF NOT EXISTS idx_conversations_created_at_desc
+    ON conversations(created_at DESC);
@@ -0,0 +1,41 @@
+-- Dashboard chart materialized views
+-- The GUI dashboard re-ran three GROUP BY aggregates every 30 seconds per
+-- open window. These views precompute those aggregates; the dashboard just
+-- SELECTs from them and refreshes the views on a slow timer, so the time
+-- windows below are relative to the last REFRESH rather than to each read.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_gen_rate_hourly AS
+SELECT DATE_TRUNC('hour', created_at) AS hour,
+       COUNT(*) AS count
+FROM conversations
+WHERE created_at > NOW() - INTERVAL '24 hours'
+GROUP BY hour;
+
+-- Unique indexes let REFRESH MATERIALIZED VIEW CONCURRENTLY work, so
+-- refreshes don't block dashboard reads
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_gen_rate_hourly_hour
+    ON mv_gen_rate_hourly(hour);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_node_counts AS
+SELECT n.hostname,
+       COUNT(c.id) AS conversation_count
+FROM nodes n
+LEFT JOIN jobs j ON j.assigned_node_id = n.id
+LEFT JOIN conversations c ON c.job_id = j.id
+WHERE n.node_type = 'generation'
+GROUP BY n.hostname;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_node_counts_hostname
+    ON mv_node_counts(hostname);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_quality_daily AS
+SELECT DATE_TRUNC('day', graded_at) AS day,
+       AVG(overall_score) AS avg_score,
+       COUNT(*) AS count
+FROM conversation_grades
+WHERE graded_at > NOW() - INTERVAL '30 days'
+  AND overall_score IS NOT NULL
+GROUP BY day;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_quality_daily_day
+    ON mv_quality_daily(day);
@@ -0,0 +1,22 @@
+-- Dashboard change notifications
+-- Statement-level AFTER INSERT triggers publish on the 'dash' channel, so
+-- the GUI refreshes when data actually changes instead of polling blind.
+-- Per-statement (not per-row): a batched execute_values insert of grades
+-- raises one notification, not one per row.
+
+CREATE OR REPLACE FUNCTION notify_dash() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('dash', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS conversations_notify_dash ON conversations;
+CREATE TRIGGER conversations_notify_dash
+    AFTER INSERT ON conversations
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_dash();
+
+DROP TRIGGER IF EXISTS conversation_grades_notify_dash ON conversation_grades;
+CREATE TRIGGER conversation_grades_notify_dash
+    AFTER INSERT ON conversation_grades
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_dash();
@@ -0,0 +1,7 @@
+-- Generate grade row ids and timestamps in the database
+-- The graders previously built str(uuid.uuid4()) and datetime.now() per
+-- row in Python; defaults let the INSERT omit both columns entirely.
+
+ALTER TABLE conversation_grades
+    ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+    ALTER COLUMN graded_at SET DEFAULT now();
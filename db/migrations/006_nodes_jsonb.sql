@@ -0,0 +1,7 @@
+-- Store node metrics as jsonb
+-- Parsed once at write time instead of json.loads per row per dashboard
+-- refresh; lets the dashboard aggregate and project fields server-side
+-- with ->> operators on the already-parsed form.
+
+ALTER TABLE nodes
+    ALTER COLUMN system_metrics TYPE jsonb USING system_metrics::jsonb;
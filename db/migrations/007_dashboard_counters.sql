@@ -0,0 +1,49 @@
+-- O(1) dashboard counters
+-- SELECT COUNT(*) FROM conversations is the one unbounded sequential scan
+-- left in the stats refresh. Keep the total in a one-row counter table
+-- maintained by statement-level triggers (exact, unlike reltuples, and
+-- never stale, unlike a matview refreshed on a timer — the dashboard
+-- refreshes the moment an insert fires NOTIFY). The jobs status buckets
+-- stay live but get an index so they are range scans, not seq scans.
+
+CREATE TABLE IF NOT EXISTS dashboard_counters (
+    name TEXT PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0
+);
+
+-- Seed (or re-seed) from the current table contents
+INSERT INTO dashboard_counters(name, value)
+VALUES ('conversations', (SELECT COUNT(*) FROM conversations))
+ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value;
+
+CREATE OR REPLACE FUNCTION bump_conversation_counter() RETURNS trigger AS $$
+BEGIN
+    UPDATE dashboard_counters
+       SET value = value + (SELECT COUNT(*) FROM new_rows)
+     WHERE name = 'conversations';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION drop_conversation_counter() RETURNS trigger AS $$
+BEGIN
+    UPDATE dashboard_counters
+       SET value = value - (SELECT COUNT(*) FROM old_rows)
+     WHERE name = 'conversations';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS conversations_count_ins ON conversations;
+CREATE TRIGGER conversations_count_ins
+    AFTER INSERT ON conversations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_conversation_counter();
+
+DROP TRIGGER IF EXISTS conversations_count_del ON conversations;
+CREATE TRIGGER conversations_count_del
+    AFTER DELETE ON conversations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION drop_conversation_counter();
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
@@ -0,0 +1,10 @@
+-- Time-window index for the quality queries
+-- conversations.created_at is already covered by
+-- idx_conversations_created_at_desc (002 migration); this adds the
+-- matching index for conversation_grades. Partial on overall_score IS
+-- NOT NULL to mirror the predicate of mv_quality_daily and the
+-- dashboard's today-slice re-aggregation, keeping the index smaller.
+
+CREATE INDEX IF NOT EXISTS idx_grades_graded_at
+    ON conversation_grades(graded_at)
+    WHERE overall_score IS NOT NULL;
@@ -34,11 +34,10 @@ def analyze_deepseek_conversation():
         ]
     }
     
-    # Extract conversation text
-    conversation_text = ""
-    for turn in conversation_json["Transcript"]:
-        role = "Customer" if turn["ParticipantId"] == "C1" else "Agent"
-        conversation_text += f"{role}: {turn['Content']}\n"
+    # Extract conversation text; join once instead of quadratic +=
+    parts = [f"{'Customer' if turn['ParticipantId'] == 'C1' else 'Agent'}: {turn['Content']}\n"
+             for turn in conversation_json["Transcript"]]
+    conversation_text = "".join(parts)
     
     print("=== DEEPSEEK R1 8B CONVERSATION ANALYSIS ===\n")
     print("CONVERSATION:")
@@ -17,30 +17,16 @@ def drop_grades_table():
     }
     
     try:
-        conn = psycopg2.connect(**db_config)
-        cur = conn.cursor()
-        
-        # Check if table exists
-        cur.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_name = 'conversation_grades'
-            )
-        """)
-        
-        table_exists = cur.fetchone()[0]
-        
-        if table_exists:
-            print("Dropping conversation_grades table...")
-            cur.execute("DROP TABLE conversation_grades")
-            conn.commit()
-            print("✅ conversation_grades table dropped successfully")
-        else:
-            print("ℹ️  conversation_grades table does not exist")
-        
-        cur.close()
-        conn.close()
-        
+        # IF EXISTS folds the existence check into the DROP itself: one
+        # round-trip, no check-then-drop race. Autocommit skips the
+        # implicit transaction around the DDL.
+        with psycopg2.connect(**db_config) as conn:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                print("Dropping conversation_grades table...")
+                cur.execute("DROP TABLE IF EXISTS conversation_grades")
+                print("✅ conversation_grades table dropped (if it existed)")
+
     except Exception as e:
         print(f"❌ Error dropping table: {e}")
 
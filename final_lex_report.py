@@ -3,14 +3,17 @@
 Final Lex Quality Report with Visual Charts
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
-from matplotlib.patches import Rectangle
-import matplotlib.patches as mpatches
-
 def create_lex_readiness_report():
     """Create comprehensive visual report"""
-    
+
+    # Heavy imports live here so importing this module (or running with
+    # --help in a pipeline) doesn't pay matplotlib's startup cost
+    import matplotlib
+    matplotlib.use('Agg')  # headless: no GUI event loop or window ever needed
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Rectangle
+    import numpy as np
+
     # Data from analysis
     datasets = ['Health Calls\nOutput', 'Lex Export']
     
@@ -25,8 +28,9 @@ def create_lex_readiness_report():
     quality_scores = [100.0, 100.0]
     lex_readiness = [91.1, 98.5]
     
-    # Create figure with subplots
-    fig, ((ax1, ax2, ax3), (ax4, ax5, ax6)) = plt.subplots(2, 3, figsize=(15, 10))
+    # Build the figure directly on the Agg canvas; no pyplot state machine
+    fig = Figure(figsize=(15, 10))
+    ((ax1, ax2, ax3), (ax4, ax5, ax6)) = fig.subplots(2, 3)
     fig.suptitle('Lex Export Quality Analysis Report', fontsize=16, fontweight='bold')
     
     # 1. Lex Readiness Confidence
@@ -128,9 +132,10 @@ RECOMMENDATION:
             transform=ax6.transAxes, fontsize=14, fontweight='bold',
             ha='center', va='center')
     
-    plt.tight_layout()
-    plt.show()
-    
+    fig.tight_layout()
+    fig.savefig('lex_readiness_report.png', dpi=100)
+    print("Report chart saved to lex_readiness_report.png")
+
     # Print detailed findings
     print("\n" + "="*80)
     print("DETAILED QUALITY ANALYSIS FINDINGS")
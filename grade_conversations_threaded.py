@@ -2,20 +2,37 @@
 """Multi-threaded conversation grader with CPU/GPU throttling"""
 
 import psycopg2
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+import io
 import json
-import uuid
 import threading
 import time
 import queue
 import psutil
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 try:
     import GPUtil
 except ImportError:
     GPUtil = None
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Rust-based orjson decoder when installed; stdlib otherwise. orjson also
+# takes bytes directly, so driver-returned buffers skip a decode step.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Shared grading kernel: JIT-compiled byte scan for long transcripts and
+# Aho-Corasick keyword matching when those packages are installed
+from grade_conversations_local import grade_conversation_local as _grade_local
+
 class ThrottledGrader:
     def __init__(self, max_workers=5, cpu_limit=80, gpu_limit=85):
         self.max_workers = max_workers
@@ -31,136 +48,234 @@ class ThrottledGrader:
         self.graded_count = 0
         self.total_count = 0
         self.lock = threading.Lock()
+        # One pool of persistent connections; workers borrow instead of
+        # paying a TCP+auth handshake per conversation
+        self.pool = ThreadedConnectionPool(max_workers, max_workers * 2, **self.db_config)
+        self._ensure_grade_defaults()
+
+        # One monitor thread samples system load and publishes it; workers
+        # wait on the event instead of each blocking in psutil/GPUtil
+        self.load_cpu = 0.0
+        self.load_gpu = 0.0
+        # Prime psutil's counters so later interval=None calls return the
+        # delta since last call instead of blocking for a sample window
+        psutil.cpu_percent(interval=None)
+        # Probe GPUs once: every GPUtil.getGPUs() call shells out to
+        # nvidia-smi, so CPU-only hosts skip GPU sampling permanently
+        try:
+            self._has_gpu = bool(GPUtil and GPUtil.getGPUs())
+        except Exception:
+            self._has_gpu = False
+        self.throttle_evt = threading.Event()
+        self.throttle_evt.set()  # set means clear to run
+        self._stop_monitor = threading.Event()
+        self._monitor_thread = threading.Thread(target=self._monitor, daemon=True)
+        self._monitor_thread.start()
+
+        # Long-lived worker threads fed through queues, so batches reuse the
+        # same threads instead of spinning up a fresh pool every 50 items
+        self.in_q = queue.Queue(maxsize=max_workers * 4)
+        self.out_q = queue.Queue()
+        self._workers = [threading.Thread(target=self._worker, daemon=True)
+                         for _ in range(max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def _ensure_grade_defaults(self):
+        """Self-heal the id/graded_at column defaults the batch INSERT
+        relies on; live tables created by conversation_grader predate the
+        005 migration and have no id default. Idempotent either way."""
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    ALTER TABLE conversation_grades
+                        ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+                        ALTER COLUMN graded_at SET DEFAULT now()
+                """)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()  # table missing entirely; the insert will say so
+            print(f"  Warning: could not ensure grade column defaults: {e}")
+        finally:
+            self.pool.putconn(conn)
+
+    def _worker(self):
+        """Grade items from in_q onto out_q until a None sentinel arrives"""
+        while True:
+            conv = self.in_q.get()
+            if conv is None:
+                self.in_q.task_done()
+                break
+            self.out_q.put(self.grade_single_conversation(conv))
+            self.in_q.task_done()
+
+    def stop(self):
+        """Shut the worker and monitor threads down"""
+        for _ in self._workers:
+            self.in_q.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._stop_monitor.set()
+        self._monitor_thread.join()
+
+    def close(self):
+        """Stop workers and release all pooled database connections"""
+        self.stop()
+        self.pool.closeall()
         
-    def get_system_load(self):
-        """Get current CPU and GPU usage"""
-        cpu_usage = psutil.cpu_percent(interval=0.1)
+    def _sample_system_load(self):
+        """Sample CPU and GPU usage (monitor thread only).
+
+        interval=None reads the usage since the previous call without
+        sleeping; the monitor's 500ms cadence is the sample window."""
+        cpu_usage = psutil.cpu_percent(interval=None)
         gpu_usage = 0
-        
-        if GPUtil:
+
+        if self._has_gpu:
             try:
                 gpus = GPUtil.getGPUs()
                 if gpus:
                     gpu_usage = max(gpu.load * 100 for gpu in gpus)
             except:
                 pass
-                
+
         return cpu_usage, gpu_usage
-    
+
+    def _monitor(self):
+        """Publish system load every 500ms and gate the throttle event"""
+        while not self._stop_monitor.is_set():
+            self.load_cpu, self.load_gpu = self._sample_system_load()
+            if self.load_cpu > self.cpu_limit or self.load_gpu > self.gpu_limit:
+                self.throttle_evt.clear()
+            else:
+                self.throttle_evt.set()
+            self._stop_monitor.wait(0.5)
+
+    def get_system_load(self):
+        """Get current CPU and GPU usage (cached by the monitor thread)"""
+        return self.load_cpu, self.load_gpu
+
     def should_throttle(self):
         """Check if we should throttle based on system load"""
         cpu_usage, gpu_usage = self.get_system_load()
         return cpu_usage > self.cpu_limit or gpu_usage > self.gpu_limit
     
     def grade_conversation_local(self, conversation_text):
-        """Simple local grading"""
-        lines = conversation_text.strip().split('\n')
-        word_count = len(conversation_text.split())
-        
-        if word_count > 100 and len(lines) > 10:
-            realness_score = 8
-        elif word_count > 50 and len(lines) > 5:
-            realness_score = 7
-        else:
-            realness_score = 6
-        
-        healthcare_keywords = ['appointment', 'doctor', 'checkup', 'medical', 'health', 'patient', 'clinic', 'schedule']
-        healthcare_valid = any(keyword in conversation_text.lower() for keyword in healthcare_keywords)
-        
-        coherence_score = 8 if len(lines) > 8 else 7
-        naturalness_score = 8 if '?' in conversation_text and word_count > 80 else 7
-        overall_score = round((realness_score + coherence_score + naturalness_score) / 3)
-        
-        return {
-            "realness_score": realness_score,
-            "coherence_score": coherence_score,
-            "naturalness_score": naturalness_score,
-            "overall_score": overall_score,
-            "healthcare_valid": healthcare_valid,
-            "brief_feedback": f"Threaded grading: {word_count} words, {len(lines)} turns",
-            "grading_error": None
-        }
+        """Heuristic grading via the shared scoring kernel.
+
+        Delegates to grade_conversations_local, whose hot loop runs as a
+        single JIT-compiled pass over the UTF-8 bytes on long transcripts
+        instead of separate split/count/'?' scans per text."""
+        return _grade_local(conversation_text)
     
     def grade_single_conversation(self, conv_data):
-        """Grade a single conversation with throttling"""
+        """Grade a single conversation with throttling; returns an insert row"""
         conv_id, content = conv_data
-        
-        # Throttle if system is under heavy load
-        while self.should_throttle():
-            time.sleep(2)
-        
+
+        # Wait out heavy load: the event wakes everyone the moment the
+        # monitor clears the throttle, with exponential backoff while set
+        backoff = 0.05
+        while not self.throttle_evt.wait(timeout=backoff):
+            backoff = min(backoff * 2, 2.0)
+
         try:
-            # Parse conversation content
-            content_data = json.loads(content) if isinstance(content, str) else content
-            
-            conversation_text = ""
-            if "Transcript" in content_data:
-                for turn in content_data["Transcript"]:
-                    conversation_text += f"{turn.get('Content', '')}\n"
-            else:
-                conversation_text = str(content_data)
-            
+            # Stream Transcript turns with ijson when available: only one
+            # turn dict is live at a time and unused keys are never built
+            conversation_text = None
+            if ijson is not None and isinstance(content, str):
+                try:
+                    parts = [turn.get('Content', '')
+                             for turn in ijson.items(io.StringIO(content), 'Transcript.item')]
+                except Exception:
+                    parts = None  # off-shape document; full parse below
+                if parts:
+                    conversation_text = '\n'.join(parts)
+
+            if conversation_text is None:
+                content_data = _loads(content) if isinstance(content, (str, bytes)) else content
+                if "Transcript" in content_data:
+                    conversation_text = '\n'.join(
+                        turn.get('Content', '') for turn in content_data["Transcript"])
+                else:
+                    conversation_text = str(content_data)
+
             if not conversation_text.strip():
                 return None
-            
+
             # Grade conversation
             grades = self.grade_conversation_local(conversation_text)
-            
-            # Store in database
-            conn = psycopg2.connect(**self.db_config)
-            cur = conn.cursor()
-            
-            grade_id = str(uuid.uuid4())
-            cur.execute("""
-                INSERT INTO conversation_grades 
-                (id, conversation_id, realness_score, coherence_score, naturalness_score, 
-                 overall_score, healthcare_valid, brief_feedback, grading_error, graded_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                grade_id, conv_id,
+
+            with self.lock:
+                self.graded_count += 1
+                if self.graded_count % 10 == 0:
+                    print(f"  Graded {self.graded_count}/{self.total_count} conversations")
+
+            # Writes happen once per batch; just hand back the row.
+            # id and graded_at come from column defaults (005 migration).
+            return (
+                conv_id,
                 grades["realness_score"],
-                grades["coherence_score"], 
+                grades["coherence_score"],
                 grades["naturalness_score"],
                 grades["overall_score"],
                 grades["healthcare_valid"],
                 grades["brief_feedback"],
-                grades["grading_error"],
-                datetime.now()
-            ))
-            
-            conn.commit()
-            cur.close()
-            conn.close()
-            
-            with self.lock:
-                self.graded_count += 1
-                if self.graded_count % 10 == 0:
-                    print(f"  Graded {self.graded_count}/{self.total_count} conversations")
-            
-            return grades
-            
+                grades["grading_error"]
+            )
+
         except Exception as e:
             print(f"  Error grading {conv_id[:8]}: {e}")
             return None
+
+    def store_grades(self, rows):
+        """Insert a batch of grade rows in one statement and one commit"""
+        if not rows:
+            return
+        conn = self.pool.getconn()
+        try:
+            cur = conn.cursor()
+            execute_values(cur, """
+                INSERT INTO conversation_grades
+                (conversation_id, realness_score, coherence_score, naturalness_score,
+                 overall_score, healthcare_valid, brief_feedback, grading_error)
+                VALUES %s
+            """, rows, page_size=200)
+            conn.commit()
+            cur.close()
+        except Exception as e:
+            conn.rollback()
+            print(f"  Error storing batch of {len(rows)} grades: {e}")
+        finally:
+            self.pool.putconn(conn)
     
     def get_ungraded_conversations(self, limit=50):
-        """Get batch of ungraded conversations"""
-        conn = psycopg2.connect(**self.db_config)
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT c.id, c.content
-            FROM conversations c
-            WHERE NOT EXISTS (SELECT 1 FROM conversation_grades WHERE conversation_id = c.id)
-            ORDER BY c.created_at DESC
-            LIMIT %s
-        """, (limit,))
-        
-        conversations = cur.fetchall()
-        cur.close()
-        conn.close()
-        
-        return conversations
+        """Stream ungraded conversations from a server-side cursor.
+
+        Yields rows as the server sends them (itersize at a time), so large
+        content blobs never pile up in one fetchall list."""
+        conn = self.pool.getconn()
+        try:
+            cur = conn.cursor(name='ungraded_stream')
+            cur.itersize = 32
+
+            # Outer-join anti-join: with an index on
+            # conversation_grades(conversation_id) the planner can walk
+            # conversations newest-first and probe the index per row,
+            # instead of re-running a correlated NOT EXISTS subquery
+            cur.execute("""
+                SELECT c.id, c.content
+                FROM conversations c
+                LEFT JOIN conversation_grades g ON g.conversation_id = c.id
+                WHERE g.conversation_id IS NULL
+                ORDER BY c.created_at DESC
+                LIMIT %s
+            """, (limit,))
+
+            yield from cur
+            cur.close()
+        finally:
+            self.pool.putconn(conn)
     
     def grade_batch_threaded(self, limit=None):
         """Grade conversations using multiple threads with throttling"""
@@ -168,31 +283,35 @@ class ThrottledGrader:
         
         total_graded = 0
         
+        batch_size = 50
+
         while True:
-            # Get batch of conversations
-            conversations = self.get_ungraded_conversations(50)
-            if not conversations:
-                break
-                
-            self.total_count = len(conversations)
+            self.total_count = batch_size
             self.graded_count = 0
-            
-            print(f"Grading batch of {len(conversations)} conversations...")
-            
-            # Process batch with thread pool
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_conv = {
-                    executor.submit(self.grade_single_conversation, conv): conv 
-                    for conv in conversations
-                }
-                
-                # Process completed tasks
-                for future in as_completed(future_to_conv):
-                    result = future.result()
-                    if result:
-                        total_graded += 1
-            
+
+            print(f"Grading next batch of up to {batch_size} conversations...")
+
+            # Rows stream from the server-side cursor straight into the work
+            # queue, overlapping fetch with grading; results collect here
+            # and hit the database as one execute_values + one commit per
+            # batch. The bounded in_q applies backpressure on the fetch.
+            batch_count = 0
+            for conv in self.get_ungraded_conversations(batch_size):
+                self.in_q.put(conv)  # blocks when full; workers drain it
+                batch_count += 1
+
+            if batch_count == 0:
+                break
+
+            rows = []
+            for _ in range(batch_count):
+                result = self.out_q.get()
+                if result:
+                    rows.append(result)
+                    total_graded += 1
+
+            self.store_grades(rows)
+
             print(f"Completed batch. Total graded: {total_graded}")
             
             # Break if we have a limit and reached it
@@ -205,7 +324,10 @@ class ThrottledGrader:
 def grade_database_conversations_threaded(limit=None, max_workers=5):
     """Main function for threaded grading"""
     grader = ThrottledGrader(max_workers=max_workers)
-    return grader.grade_batch_threaded(limit=limit)
+    try:
+        return grader.grade_batch_threaded(limit=limit)
+    finally:
+        grader.close()
 
 if __name__ == "__main__":
     grade_database_conversations_threaded()
\ No newline at end of file
@@ -6,9 +6,10 @@ GUI Dashboard for Transcript Intelligence Platform
 import tkinter as tk
 from tkinter import ttk, messagebox
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import psycopg2
-import json
+import select
 import threading
 import time
 from datetime import datetime, timedelta
@@ -20,6 +21,56 @@ try:
 except ImportError:
     GPUtil = None
 
+# Chart aggregates precomputed by db/migrations/003_dashboard_matviews.sql;
+# refreshed by a background thread so the 30-second UI refresh just reads
+DASHBOARD_MATVIEWS = ('mv_gen_rate_hourly', 'mv_node_counts', 'mv_quality_daily')
+MATVIEW_REFRESH_SECONDS = 300
+
+class _ChartBlitter:
+    """Blit a chart's dynamic artists over a cached static background.
+
+    Registered artists are marked animated, so full renders (first draw,
+    resize, anything that calls canvas.draw) skip them; the draw_event
+    hook then re-caches the background and paints them on top. update()
+    takes the fast path — restore background, draw artists, blit — which
+    skips re-rendering axes, ticks and spines entirely. Call invalidate()
+    whenever the static parts (axis limits, tick labels) changed."""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.artists = []
+        self._bg = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add(self, artist):
+        artist.set_animated(True)
+        self.artists.append(artist)
+        return artist
+
+    def discard(self, artist):
+        if artist in self.artists:
+            self.artists.remove(artist)
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            artist.axes.draw_artist(artist)
+
+    def _on_draw(self, event):
+        self._bg = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def invalidate(self):
+        self._bg = None
+
+    def update(self):
+        if self._bg is None:
+            self.canvas.draw()  # _on_draw re-caches and paints on top
+        else:
+            self.canvas.restore_region(self._bg)
+            self._draw_artists()
+            self.canvas.blit(self.canvas.figure.bbox)
+
 class TranscriptDashboard:
     def __init__(self):
         self.root = tk.Tk()
@@ -43,7 +94,20 @@ class TranscriptDashboard:
         self.grader_type = tk.StringVar(value="openai")  # Default to OpenAI
         self.last_progress_update = 0
         
+        # One persistent connection serves every refresh; opening a fresh
+        # one per update meant 4-5 TCP+auth handshakes each 30 seconds
+        self._conn = None
+
+        # Quality chart cache: day -> (avg_score, count). Closed days never
+        # change, so refreshes only re-aggregate today's grades
+        self._quality_cache = {}
+        self._quality_cache_day = None
+        # Tables don't un-create themselves; check existence once, not
+        # one information_schema round-trip per refresh
+        self._grades_table_ok = False
+
         self.setup_ui()
+        self.start_matview_refresher()
         self.start_auto_refresh()
     
     def setup_ui(self):
@@ -169,12 +233,18 @@ class TranscriptDashboard:
         self.gen_fig, self.gen_ax = plt.subplots(figsize=(6, 3))
         self.gen_canvas = FigureCanvasTkAgg(self.gen_fig, chart_frame)
         self.gen_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Initial empty chart
-        self.gen_ax.set_title("Generation Rate Over Time")
+
+        # Titles, grid and the Line2D artist are created once; refreshes
+        # only push new data into the line instead of clear()+re-plot
+        self.gen_line, = self.gen_ax.plot([], [], marker='o', linewidth=2)
+        self.gen_ax.set_title("Generation Rate (Last 24 Hours)")
         self.gen_ax.set_xlabel("Time")
         self.gen_ax.set_ylabel("Conversations/Hour")
+        self.gen_ax.grid(True, alpha=0.3)
+        self.gen_ax.xaxis_date()
         self.gen_fig.tight_layout()
+        self.gen_blit = _ChartBlitter(self.gen_canvas)
+        self.gen_blit.add(self.gen_line)
     
     def setup_node_chart(self, parent):
         """Setup node performance chart"""
@@ -184,11 +254,16 @@ class TranscriptDashboard:
         self.node_fig, self.node_ax = plt.subplots(figsize=(6, 3))
         self.node_canvas = FigureCanvasTkAgg(self.node_fig, chart_frame)
         self.node_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Initial empty chart
+
+        # Bars are created on the first refresh and then reused; the node
+        # set rarely changes, so refreshes mostly just move rectangles
+        self.node_bars = None
+        self.node_bar_nodes = None
+        self.node_bar_labels = []
         self.node_ax.set_title("Conversations by Node")
         self.node_ax.set_ylabel("Conversations Generated")
         self.node_fig.tight_layout()
+        self.node_blit = _ChartBlitter(self.node_canvas)
     
     def setup_quality_chart(self, parent):
         """Setup quality metrics chart"""
@@ -198,17 +273,84 @@ class TranscriptDashboard:
         self.quality_fig, self.quality_ax = plt.subplots(figsize=(12, 2.5))
         self.quality_canvas = FigureCanvasTkAgg(self.quality_fig, chart_frame)
         self.quality_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Initial empty chart
-        self.quality_ax.set_title("Quality Scores Over Time")
-        self.quality_ax.set_xlabel("Time")
-        self.quality_ax.set_ylabel("Score")
+
+        # Create the score line, the count axis and the status text once;
+        # clear()+twinx() per refresh leaked a new twin axis every 30s
+        self.quality_line, = self.quality_ax.plot(
+            [], [], marker='o', linewidth=2, color='green', label='Avg Quality Score')
+        self.quality_ax2 = self.quality_ax.twinx()
+        self.quality_bars = None
+        self.quality_bar_days = None
+        self.quality_msg = self.quality_ax.text(
+            0.5, 0.5, '', ha='center', va='center',
+            transform=self.quality_ax.transAxes, visible=False)
+        self.quality_ax.set_title("Quality Scores Over Time (Last 30 Days)")
+        self.quality_ax.set_xlabel("Date")
+        self.quality_ax.set_ylabel("Average Score", color='green')
+        self.quality_ax.tick_params(axis='y', labelcolor='green')
+        self.quality_ax.grid(True, alpha=0.3)
+        self.quality_ax.xaxis_date()
+        self.quality_ax2.set_ylabel("Conversations Graded", color='blue')
+        self.quality_ax2.tick_params(axis='y', labelcolor='blue')
         self.quality_fig.tight_layout()
+        self.quality_blit = _ChartBlitter(self.quality_canvas)
+        self.quality_blit.add(self.quality_line)
+        self.quality_blit.add(self.quality_msg)
     
     def get_db(self):
-        """Get database connection"""
-        return psycopg2.connect(**self.db_config)
-    
+        """Get the shared dashboard connection, reconnecting if it dropped"""
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(**self.db_config)
+            # autocommit: reads never leave an idle transaction open
+            self._conn.autocommit = True
+        return self._conn
+
+    def _drop_db(self):
+        """Discard the shared connection so the next get_db reconnects"""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def _select_chart_data(self, conn, view_sql, fallback_sql):
+        """Read a chart's rows from its materialized view.
+
+        Falls back to the live aggregate when the view is missing
+        (003 migration not run yet)."""
+        cur = conn.cursor()
+        try:
+            try:
+                cur.execute(view_sql)
+            except psycopg2.Error:
+                conn.rollback()
+                cur.execute(fallback_sql)
+            return cur.fetchall()
+        finally:
+            cur.close()
+
+    def start_matview_refresher(self):
+        """Refresh the chart materialized views on a slow background timer"""
+        def refresher():
+            while True:
+                try:
+                    conn = psycopg2.connect(**self.db_config)
+                    conn.autocommit = True  # CONCURRENTLY can't run in a transaction
+                    cur = conn.cursor()
+                    for view in DASHBOARD_MATVIEWS:
+                        try:
+                            cur.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+                        except psycopg2.Error:
+                            pass  # view missing; charts fall back to live queries
+                    cur.close()
+                    conn.close()
+                except Exception as e:
+                    print(f"Error refreshing materialized views: {e}")
+                time.sleep(MATVIEW_REFRESH_SECONDS)
+
+        threading.Thread(target=refresher, daemon=True).start()
+
     def refresh_data(self):
         """Refresh all dashboard data"""
         self.status_var.set("Refreshing data...")
@@ -221,6 +363,8 @@ class TranscriptDashboard:
             self.update_quality_chart()
             self.status_var.set(f"Last updated: {datetime.now().strftime('%H:%M:%S')}")
         except Exception as e:
+            if isinstance(e, psycopg2.OperationalError):
+                self._drop_db()  # stale connection; next refresh reconnects
             self.status_var.set(f"Error: {e}")
             messagebox.showerror("Error", f"Failed to refresh data: {e}")
     
@@ -228,172 +372,108 @@ class TranscriptDashboard:
         """Update statistics labels"""
         conn = self.get_db()
         cur = conn.cursor()
-        
-        # Total conversations
-        cur.execute("SELECT COUNT(*) FROM conversations")
-        total_conversations = cur.fetchone()[0]
+
+        # Everything this panel shows as scalar subqueries in one
+        # statement — six counters plus the node-metric averages — so the
+        # whole stats refresh costs a single network round-trip. The
+        # conversations total reads the trigger-maintained counter
+        # (007 migration) instead of scanning the table; the fallback
+        # COUNT(*) covers databases without that migration.
+        stats_sql = """
+            SELECT
+                {total},
+                (SELECT COUNT(*) FROM nodes WHERE status = 'online' AND node_type = 'generation'),
+                (SELECT current_run FROM run_counter LIMIT 1),
+                (SELECT COUNT(*) FROM jobs WHERE status = 'pending'),
+                (SELECT COUNT(*) FROM jobs WHERE status = 'completed'),
+                (SELECT COUNT(*) FROM conversations
+                 WHERE created_at > NOW() - INTERVAL '1 hour'),
+                m.*
+            FROM (
+                SELECT
+                    AVG((system_metrics->>'cpu_percent')::float),
+                    AVG((system_metrics->>'memory_percent')::float),
+                    AVG(NULLIF((system_metrics->>'gpu_usage')::float, 0)),
+                    AVG((system_metrics->>'cpu_temp')::float),
+                    AVG((system_metrics->>'gpu_temp')::float)
+                FROM nodes
+                WHERE status = 'online' AND system_metrics IS NOT NULL
+            ) m
+        """
+        try:
+            cur.execute(stats_sql.format(
+                total="(SELECT value FROM dashboard_counters WHERE name = 'conversations')"))
+        except psycopg2.Error:
+            conn.rollback()
+            cur.execute(stats_sql.format(
+                total="(SELECT COUNT(*) FROM conversations)"))
+        (total_conversations, active_nodes, current_run,
+         pending_jobs, completed_jobs, conversations_last_hour,
+         avg_cpu, avg_memory, avg_gpu, avg_cpu_temp, avg_gpu_temp) = cur.fetchone()
+        cur.close()
+
         self.stats_labels["total_conversations"].config(text=str(total_conversations))
-        
-        # Active nodes
-        cur.execute("SELECT COUNT(*) FROM nodes WHERE status = 'online' AND node_type = 'generation'")
-        active_nodes = cur.fetchone()[0]
         self.stats_labels["active_nodes"].config(text=str(active_nodes))
-        
-        # Current run
-        cur.execute("SELECT current_run FROM run_counter LIMIT 1")
-        result = cur.fetchone()
-        current_run = result[0] if result else 0
-        self.stats_labels["current_run"].config(text=str(current_run))
-        
-        # Jobs
-        cur.execute("SELECT COUNT(*) FROM jobs WHERE status = 'pending'")
-        pending_jobs = cur.fetchone()[0]
+        # current_run is NULL when run_counter is empty
+        self.stats_labels["current_run"].config(text=str(current_run if current_run is not None else 0))
         self.stats_labels["pending_jobs"].config(text=str(pending_jobs))
-        
-        cur.execute("SELECT COUNT(*) FROM jobs WHERE status = 'completed'")
-        completed_jobs = cur.fetchone()[0]
         self.stats_labels["completed_jobs"].config(text=str(completed_jobs))
-        
-        # Conversations per hour (last hour)
-        cur.execute("""
-            SELECT COUNT(*) FROM conversations 
-            WHERE created_at > NOW() - INTERVAL '1 hour'
-        """)
-        conversations_last_hour = cur.fetchone()[0]
         self.stats_labels["conversations_per_hour"].config(text=str(conversations_last_hour))
-        
-        # Remote node metrics
-        self.update_node_metrics()
-        
-        cur.close()
-        conn.close()
-    
-    def update_node_metrics(self):
-        """Update metrics from remote nodes"""
-        try:
-            conn = self.get_db()
-            cur = conn.cursor()
-            
-            # Get system metrics from all active nodes
-            cur.execute("""
-                SELECT hostname, system_metrics 
-                FROM nodes 
-                WHERE status = 'online' AND system_metrics IS NOT NULL
-                ORDER BY last_seen DESC
-            """)
-            
-            nodes_data = cur.fetchall()
-            
-            if nodes_data:
-                # Aggregate metrics from all nodes
-                total_cpu = 0
-                total_memory = 0
-                total_gpu = 0
-                cpu_temps = []
-                gpu_temps = []
-                node_count = 0
-                
-                for hostname, metrics_json in nodes_data:
-                    try:
-                        metrics = json.loads(metrics_json)
-                        if metrics.get('cpu_percent') is not None:
-                            total_cpu += metrics['cpu_percent']
-                            node_count += 1
-                        if metrics.get('memory_percent') is not None:
-                            total_memory += metrics['memory_percent']
-                        if metrics.get('gpu_usage') is not None:
-                            total_gpu += metrics['gpu_usage']
-                        if metrics.get('cpu_temp') is not None:
-                            cpu_temps.append(metrics['cpu_temp'])
-                        if metrics.get('gpu_temp') is not None:
-                            gpu_temps.append(metrics['gpu_temp'])
-                    except:
-                        continue
-                
-                # Update labels with aggregated data
-                if node_count > 0:
-                    avg_cpu = total_cpu / node_count
-                    avg_memory = total_memory / node_count
-                    avg_gpu = total_gpu / node_count if total_gpu > 0 else 0
-                    
-                    self.stats_labels["cpu_usage"].config(text=f"{avg_cpu:.1f}%")
-                    self.stats_labels["memory_usage"].config(text=f"{avg_memory:.1f}%")
-                    self.stats_labels["gpu_usage"].config(text=f"{avg_gpu:.1f}%" if avg_gpu > 0 else "N/A")
-                    
-                    if cpu_temps:
-                        avg_cpu_temp = sum(cpu_temps) / len(cpu_temps)
-                        self.stats_labels["cpu_temp"].config(text=f"{avg_cpu_temp:.1f}°C")
-                    else:
-                        self.stats_labels["cpu_temp"].config(text="N/A")
-                    
-                    if gpu_temps:
-                        avg_gpu_temp = sum(gpu_temps) / len(gpu_temps)
-                        self.stats_labels["gpu_temp"].config(text=f"{avg_gpu_temp:.1f}°C")
-                    else:
-                        self.stats_labels["gpu_temp"].config(text="N/A")
-                else:
-                    # No metrics available
-                    for key in ["cpu_usage", "memory_usage", "gpu_usage", "cpu_temp", "gpu_temp"]:
-                        self.stats_labels[key].config(text="N/A")
-            else:
-                # No nodes with metrics
-                for key in ["cpu_usage", "memory_usage", "gpu_usage", "cpu_temp", "gpu_temp"]:
-                    self.stats_labels[key].config(text="N/A")
-            
-            cur.close()
-            conn.close()
-            
-        except Exception as e:
-            print(f"Error updating node metrics: {e}")
-            for key in ["cpu_usage", "memory_usage", "gpu_usage", "cpu_temp", "gpu_temp"]:
-                self.stats_labels[key].config(text="Error")
+
+        self.stats_labels["cpu_usage"].config(
+            text=f"{avg_cpu:.1f}%" if avg_cpu is not None else "N/A")
+        self.stats_labels["memory_usage"].config(
+            text=f"{avg_memory:.1f}%" if avg_memory is not None else "N/A")
+        self.stats_labels["gpu_usage"].config(
+            text=f"{avg_gpu:.1f}%" if avg_gpu is not None else "N/A")
+        self.stats_labels["cpu_temp"].config(
+            text=f"{avg_cpu_temp:.1f}°C" if avg_cpu_temp is not None else "N/A")
+        self.stats_labels["gpu_temp"].config(
+            text=f"{avg_gpu_temp:.1f}°C" if avg_gpu_temp is not None else "N/A")
     
     def update_generation_chart(self):
         """Update generation rate chart"""
         conn = self.get_db()
-        cur = conn.cursor()
-        
-        # Get hourly conversation counts for last 24 hours
-        cur.execute("""
-            SELECT 
+
+        # Hourly counts come precomputed from the materialized view; only
+        # its periodic refresh pays for the 24-hour scan
+        data = self._select_chart_data(conn,
+            "SELECT hour, count FROM mv_gen_rate_hourly ORDER BY hour",
+            """
+            SELECT
                 DATE_TRUNC('hour', created_at) as hour,
                 COUNT(*) as count
-            FROM conversations 
+            FROM conversations
             WHERE created_at > NOW() - INTERVAL '24 hours'
             GROUP BY hour
             ORDER BY hour
-        """)
-        
-        data = cur.fetchall()
-        
+            """)
+
         if data:
             hours = [row[0] for row in data]
             counts = [row[1] for row in data]
-            
-            self.gen_ax.clear()
-            self.gen_ax.plot(hours, counts, marker='o', linewidth=2)
-            self.gen_ax.set_title("Generation Rate (Last 24 Hours)")
-            self.gen_ax.set_xlabel("Time")
-            self.gen_ax.set_ylabel("Conversations/Hour")
-            self.gen_ax.grid(True, alpha=0.3)
-            
-            # Format x-axis
-            self.gen_fig.autofmt_xdate()
-        
-        self.gen_fig.tight_layout()
-        self.gen_canvas.draw()
-        
-        cur.close()
-        conn.close()
+
+            # Push new data into the existing artist; no clear/re-plot
+            old_limits = (self.gen_ax.get_xlim(), self.gen_ax.get_ylim())
+            self.gen_line.set_data(mdates.date2num(hours), counts)
+            self.gen_ax.relim()
+            self.gen_ax.autoscale_view()
+            if (self.gen_ax.get_xlim(), self.gen_ax.get_ylim()) != old_limits:
+                # Axes/ticks changed: the cached background is stale
+                self.gen_fig.autofmt_xdate()
+                self.gen_blit.invalidate()
+            # Unchanged limits blit just the line over the cached backdrop
+            self.gen_blit.update()
     
     def update_node_chart(self):
         """Update node performance chart"""
         conn = self.get_db()
-        cur = conn.cursor()
-        
-        # Get conversation counts by node
-        cur.execute("""
-            SELECT 
+
+        # Per-node totals come precomputed from the materialized view
+        data = self._select_chart_data(conn,
+            "SELECT hostname, conversation_count FROM mv_node_counts ORDER BY conversation_count DESC",
+            """
+            SELECT
                 n.hostname,
                 COUNT(c.id) as conversation_count
             FROM nodes n
@@ -402,106 +482,146 @@ class TranscriptDashboard:
             WHERE n.node_type = 'generation'
             GROUP BY n.hostname
             ORDER BY conversation_count DESC
-        """)
-        
-        data = cur.fetchall()
-        
+            """)
+
         if data:
             nodes = [row[0] for row in data]
             counts = [row[1] for row in data]
-            
-            self.node_ax.clear()
-            bars = self.node_ax.bar(nodes, counts, color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728'])
-            self.node_ax.set_title("Conversations by Node")
-            self.node_ax.set_ylabel("Conversations Generated")
-            
-            # Add value labels on bars
-            for bar, count in zip(bars, counts):
-                height = bar.get_height()
-                self.node_ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                                 str(count), ha='center', va='bottom')
-        
-        self.node_fig.tight_layout()
-        self.node_canvas.draw()
-        
-        cur.close()
-        conn.close()
+
+            if self.node_bar_nodes != nodes:
+                # Node set changed (or first draw): rebuild bars and labels
+                self.node_ax.clear()
+                self.node_blit.artists.clear()
+                self.node_bars = self.node_ax.bar(
+                    nodes, counts, color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728'])
+                self.node_bar_nodes = nodes
+                self.node_ax.set_title("Conversations by Node")
+                self.node_ax.set_ylabel("Conversations Generated")
+                self.node_bar_labels = [
+                    self.node_ax.text(bar.get_x() + bar.get_width()/2., count + 0.5,
+                                      str(count), ha='center', va='bottom')
+                    for bar, count in zip(self.node_bars, counts)]
+                for artist in (*self.node_bars, *self.node_bar_labels):
+                    self.node_blit.add(artist)
+                self.node_fig.tight_layout()
+                self.node_blit.invalidate()
+            else:
+                # Same nodes: just move the rectangles and value labels
+                for bar, label, count in zip(self.node_bars, self.node_bar_labels, counts):
+                    bar.set_height(count)
+                    label.set_y(count + 0.5)
+                    label.set_text(str(count))
+            # relim ignores bar patches; scale the y-axis explicitly
+            old_ylim = self.node_ax.get_ylim()
+            self.node_ax.set_ylim(0, max(counts) * 1.15 + 1)
+            if self.node_ax.get_ylim() != old_ylim:
+                self.node_blit.invalidate()
+            self.node_blit.update()
     
     def update_quality_chart(self):
         """Update quality metrics chart"""
         conn = self.get_db()
-        cur = conn.cursor()
-        
-        # Check if conversation_grades table exists
-        cur.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_name = 'conversation_grades'
-            )
-        """)
-        
-        if not cur.fetchone()[0]:
-            # No quality data available
-            self.quality_ax.clear()
-            self.quality_ax.text(0.5, 0.5, 'No quality data available\nRun quality analysis to see metrics', 
-                               ha='center', va='center', transform=self.quality_ax.transAxes)
-            self.quality_ax.set_title("Quality Scores Over Time")
-            self.quality_canvas.draw()
+
+        if not self._grades_table_ok:
+            # Check if conversation_grades table exists — once; the answer
+            # only ever flips from no to yes
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT EXISTS (
+                    SELECT FROM information_schema.tables
+                    WHERE table_name = 'conversation_grades'
+                )
+            """)
+            self._grades_table_ok = cur.fetchone()[0]
             cur.close()
-            conn.close()
-            return
-        
-        # Get quality scores over time
+            if not self._grades_table_ok:
+                # No quality data available
+                self.quality_msg.set_text('No quality data available\nRun quality analysis to see metrics')
+                self.quality_msg.set_visible(True)
+                self.quality_blit.update()
+                return
+
+        today = datetime.now().date()
+        if self._quality_cache_day != today:
+            # First refresh of the day: load the whole 30-day window once,
+            # precomputed by the materialized view when it exists
+            rows = self._select_chart_data(conn,
+                "SELECT day, avg_score, count FROM mv_quality_daily ORDER BY day",
+                """
+                SELECT
+                    DATE_TRUNC('day', graded_at) as day,
+                    AVG(overall_score) as avg_score,
+                    COUNT(*) as count
+                FROM conversation_grades
+                WHERE graded_at > NOW() - INTERVAL '30 days'
+                AND overall_score IS NOT NULL
+                GROUP BY day
+                ORDER BY day
+                """)
+            self._quality_cache = {day: (avg_score, count)
+                                   for day, avg_score, count in rows}
+            self._quality_cache_day = today
+
+        # Closed days are served from the cache; only today's slice can
+        # change between refreshes, so re-aggregate just that
+        cur = conn.cursor()
         cur.execute("""
-            SELECT 
+            SELECT
                 DATE_TRUNC('day', graded_at) as day,
                 AVG(overall_score) as avg_score,
                 COUNT(*) as count
-            FROM conversation_grades 
-            WHERE graded_at > NOW() - INTERVAL '30 days'
+            FROM conversation_grades
+            WHERE graded_at >= CURRENT_DATE
             AND overall_score IS NOT NULL
             GROUP BY day
-            ORDER BY day
         """)
-        
-        data = cur.fetchall()
-        
+        for day, avg_score, count in cur.fetchall():
+            self._quality_cache[day] = (avg_score, count)
+        cur.close()
+
+        data = [(day, avg_score, count)
+                for day, (avg_score, count) in sorted(self._quality_cache.items())]
+
         if data:
             days = [row[0] for row in data]
             scores = [row[1] for row in data]
             counts = [row[2] for row in data]
-            
-            self.quality_ax.clear()
-            
-            # Plot average scores
-            line1 = self.quality_ax.plot(days, scores, marker='o', linewidth=2, 
-                                        color='green', label='Avg Quality Score')
-            self.quality_ax.set_ylabel("Average Score", color='green')
-            self.quality_ax.tick_params(axis='y', labelcolor='green')
-            
-            # Add second y-axis for counts
-            ax2 = self.quality_ax.twinx()
-            line2 = ax2.bar(days, counts, alpha=0.3, color='blue', label='Conversations Graded')
-            ax2.set_ylabel("Conversations Graded", color='blue')
-            ax2.tick_params(axis='y', labelcolor='blue')
-            
-            self.quality_ax.set_title("Quality Scores Over Time (Last 30 Days)")
-            self.quality_ax.set_xlabel("Date")
-            self.quality_ax.grid(True, alpha=0.3)
-            
-            # Format x-axis
-            self.quality_fig.autofmt_xdate()
+
+            self.quality_msg.set_visible(False)
+
+            # Score line reuses its artist; the count bars rebuild only
+            # when a new day enters the window
+            old_limits = (self.quality_ax.get_xlim(), self.quality_ax.get_ylim(),
+                          self.quality_ax2.get_ylim())
+            self.quality_line.set_data(mdates.date2num(days), scores)
+            self.quality_ax.relim()
+            self.quality_ax.autoscale_view()
+
+            if self.quality_bar_days != days:
+                if self.quality_bars is not None:
+                    for bar in self.quality_bars:
+                        self.quality_blit.discard(bar)
+                    self.quality_bars.remove()
+                self.quality_bars = self.quality_ax2.bar(
+                    days, counts, alpha=0.3, color='blue', label='Conversations Graded')
+                for bar in self.quality_bars:
+                    self.quality_blit.add(bar)
+                self.quality_bar_days = days
+                self.quality_blit.invalidate()
+            else:
+                for bar, count in zip(self.quality_bars, counts):
+                    bar.set_height(count)
+            self.quality_ax2.set_ylim(0, max(counts) * 1.15 + 1)
+
+            if (self.quality_ax.get_xlim(), self.quality_ax.get_ylim(),
+                    self.quality_ax2.get_ylim()) != old_limits:
+                self.quality_fig.autofmt_xdate()
+                self.quality_blit.invalidate()
         else:
-            self.quality_ax.clear()
-            self.quality_ax.text(0.5, 0.5, 'No quality scores available', 
-                               ha='center', va='center', transform=self.quality_ax.transAxes)
-            self.quality_ax.set_title("Quality Scores Over Time")
-        
-        self.quality_fig.tight_layout()
-        self.quality_canvas.draw()
-        
-        cur.close()
-        conn.close()
+            self.quality_msg.set_text('No quality scores available')
+            self.quality_msg.set_visible(True)
+
+        self.quality_blit.update()
     
     def open_grading_settings(self):
         """Open grading settings dialog"""
@@ -740,38 +860,31 @@ class TranscriptDashboard:
             conn = self.get_db()
             cur = conn.cursor()
             
-            # Get all nodes with their metrics
+            # Project the metric fields out of the jsonb column server-side
+            # (006 migration); Python just formats floats — no json.loads,
+            # and missing fields arrive as NULL
             cur.execute("""
-                SELECT hostname, node_type, status, system_metrics, last_seen
-                FROM nodes 
+                SELECT hostname, node_type, status,
+                       (system_metrics->>'cpu_percent')::float,
+                       (system_metrics->>'memory_percent')::float,
+                       (system_metrics->>'gpu_usage')::float,
+                       (system_metrics->>'cpu_temp')::float,
+                       (system_metrics->>'gpu_temp')::float,
+                       last_seen
+                FROM nodes
                 ORDER BY node_type, hostname
             """)
-            
+
             nodes_data = cur.fetchall()
-            
-            for hostname, node_type, status, metrics_json, last_seen in nodes_data:
-                # Parse metrics
-                cpu_usage = "N/A"
-                memory_usage = "N/A"
-                gpu_usage = "N/A"
-                cpu_temp = "N/A"
-                gpu_temp = "N/A"
-                
-                if metrics_json:
-                    try:
-                        if isinstance(metrics_json, str):
-                            metrics = json.loads(metrics_json)
-                        else:
-                            metrics = metrics_json
-                        
-                        cpu_usage = f"{metrics.get('cpu_percent'):.1f}%" if metrics.get('cpu_percent') is not None else "N/A"
-                        memory_usage = f"{metrics.get('memory_percent'):.1f}%" if metrics.get('memory_percent') is not None else "N/A"
-                        gpu_usage = f"{metrics.get('gpu_usage'):.1f}%" if metrics.get('gpu_usage') is not None else "N/A"
-                        cpu_temp = f"{metrics.get('cpu_temp'):.1f}°C" if metrics.get('cpu_temp') is not None else "N/A"
-                        gpu_temp = f"{metrics.get('gpu_temp'):.1f}°C" if metrics.get('gpu_temp') is not None else "N/A"
-                    except Exception as e:
-                        print(f"Error parsing metrics for {hostname}: {e}")
-                
+
+            for (hostname, node_type, status, cpu, memory, gpu,
+                 cpu_temp_val, gpu_temp_val, last_seen) in nodes_data:
+                cpu_usage = f"{cpu:.1f}%" if cpu is not None else "N/A"
+                memory_usage = f"{memory:.1f}%" if memory is not None else "N/A"
+                gpu_usage = f"{gpu:.1f}%" if gpu is not None else "N/A"
+                cpu_temp = f"{cpu_temp_val:.1f}°C" if cpu_temp_val is not None else "N/A"
+                gpu_temp = f"{gpu_temp_val:.1f}°C" if gpu_temp_val is not None else "N/A"
+
                 # Format last seen
                 if last_seen:
                     time_diff = datetime.now() - last_seen
@@ -799,10 +912,9 @@ class TranscriptDashboard:
                     tree.set(item, 'status', '🔴 Offline')
                 else:
                     tree.set(item, 'status', f'🟡 {status}')
-            
+
             cur.close()
-            conn.close()
-            
+
         except Exception as e:
             print(f"Error refreshing node details: {e}")
             tree.insert('', tk.END, values=('Error', str(e), '', '', '', '', '', ''))
@@ -818,41 +930,65 @@ class TranscriptDashboard:
             )
             
             if filename:
+                # Assemble the whole report, then write once: one buffered
+                # call instead of a locked f.write per line
+                parts = [
+                    "Transcript Intelligence Platform Report\n",
+                    "=" * 50 + "\n",
+                    f"Generated: {datetime.now()}\n\n",
+                    "System Statistics:\n",
+                ]
+                parts.extend(f"  {key}: {label.cget('text')}\n"
+                             for key, label in self.stats_labels.items())
+                parts.append("\nReport exported successfully.")
+
                 with open(filename, 'w') as f:
-                    f.write("Transcript Intelligence Platform Report\n")
-                    f.write("=" * 50 + "\n")
-                    f.write(f"Generated: {datetime.now()}\n\n")
-                    
-                    # Write stats
-                    f.write("System Statistics:\n")
-                    for key, label in self.stats_labels.items():
-                        f.write(f"  {key}: {label.cget('text')}\n")
-                    
-                    f.write("\nReport exported successfully.")
-                
+                    f.write(''.join(parts))
+
                 messagebox.showinfo("Success", f"Report exported to {filename}")
         
         except Exception as e:
             messagebox.showerror("Error", f"Export failed: {e}")
     
     def start_auto_refresh(self):
-        """Start automatic data refresh"""
-        def auto_refresh():
+        """Refresh on Postgres NOTIFY events, with a 30-second fallback.
+
+        The 004 migration's triggers publish on the 'dash' channel after
+        inserts; refreshes land milliseconds after data changes instead of
+        up to 30 seconds later. The select timeout doubles as a slow
+        periodic refresh so node liveness (no trigger) still updates."""
+        def listener():
             while True:
-                time.sleep(30)  # Refresh every 30 seconds
                 try:
-                    self.root.after(0, self.refresh_data)
-                except:
-                    break
-        
+                    conn = psycopg2.connect(**self.db_config)
+                    conn.autocommit = True  # LISTEN must take effect immediately
+                    cur = conn.cursor()
+                    cur.execute("LISTEN dash")
+                    while True:
+                        # Block on the socket instead of sleeping blind
+                        if select.select([conn], [], [], 30) != ([], [], []):
+                            conn.poll()
+                            if not conn.notifies:
+                                continue
+                            # Coalesce bursts: drain what's queued, let
+                            # stragglers arrive, then refresh once
+                            conn.notifies.clear()
+                            time.sleep(1.0)
+                            conn.poll()
+                            conn.notifies.clear()
+                        self.root.after(0, self.refresh_data)
+                except Exception as e:
+                    print(f"Dashboard listener error: {e}")
+                    time.sleep(5)
+
         # Initial refresh
         self.root.after(1000, self.refresh_data)
-        
-        # Start background refresh thread
-        threading.Thread(target=auto_refresh, daemon=True).start()
+
+        threading.Thread(target=listener, daemon=True).start()
     
     def on_closing(self):
         """Handle window close event"""
+        self._drop_db()
         try:
             self.root.quit()
             self.root.destroy()
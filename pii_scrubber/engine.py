@@ -34,22 +34,28 @@ ID_CONTEXTS = [
     r'insurance\s+(?:ID|number)\s*:?\s*([A-Z0-9]{6,12})\b'
 ]
 
+# Compiled once at import; the scrub path runs on every worker output, so
+# per-call re.findall/re.sub lookups with flags are pure overhead.
+PII_REGEX = {pii_type: re.compile(pattern, re.IGNORECASE)
+             for pii_type, pattern in PII_PATTERNS.items()}
+ID_REGEX = [re.compile(pattern, re.IGNORECASE) for pattern in ID_CONTEXTS]
+
 def detect_pii_regex(text: str) -> Dict[str, list]:
     """Detect PII using regex patterns. Returns matches by type."""
     matches = {}
     
     # Standard patterns
-    for pii_type, pattern in PII_PATTERNS.items():
-        found = re.findall(pattern, text, re.IGNORECASE)
+    for pii_type, regex in PII_REGEX.items():
+        found = regex.findall(text)
         if pii_type == 'NAME':
             # Filter out common words
             found = [match for match in found if match.lower() not in NAME_ALLOWLIST]
         matches[pii_type] = found
-    
+
     # ID patterns with context
     id_matches = []
-    for pattern in ID_CONTEXTS:
-        id_matches.extend(re.findall(pattern, text, re.IGNORECASE))
+    for regex in ID_REGEX:
+        id_matches.extend(regex.findall(text))
     matches['ID'] = id_matches
     
     return matches
@@ -68,9 +74,9 @@ def scrub_text_regex(text: str, placeholder_style: str = "angle") -> str:
     patterns_order = ['PHONE', 'EMAIL', 'DATE', 'ADDRESS', 'NAME']
     
     for pii_type in patterns_order:
-        pattern = PII_PATTERNS[pii_type]
+        regex = PII_REGEX[pii_type]
         placeholder = fmt.format(pii_type)
-        
+
         if pii_type == 'NAME':
             # Special handling for names - check allowlist
             def name_replacer(match):
@@ -78,14 +84,14 @@ def scrub_text_regex(text: str, placeholder_style: str = "angle") -> str:
                 if name.lower() not in NAME_ALLOWLIST:
                     return placeholder
                 return name
-            result = re.sub(pattern, name_replacer, result, flags=re.IGNORECASE)
+            result = regex.sub(name_replacer, result)
         else:
-            result = re.sub(pattern, placeholder, result, flags=re.IGNORECASE)
-    
+            result = regex.sub(placeholder, result)
+
     # Handle ID patterns with context
-    for pattern in ID_CONTEXTS:
-        result = re.sub(pattern, lambda m: m.group(0).replace(m.group(1), fmt.format("ID")), 
-                       result, flags=re.IGNORECASE)
+    for regex in ID_REGEX:
+        result = regex.sub(lambda m: m.group(0).replace(m.group(1), fmt.format("ID")),
+                           result)
     
     return result
 